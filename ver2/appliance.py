@@ -1,8 +1,11 @@
 from tkinter import *
+import copy
 import time
+from interval_stats import IntervalStats
+from rolling_extrema import RollingExtrema
 
 class Appliance:
-    def __init__(self, name, ID):
+    def __init__(self, name, ID, history_length=300):
         self.name = name
         self.power_status = False
         self.ID = ID
@@ -11,12 +14,17 @@ class Appliance:
         self.type = 0  # 0: load, 1: source, 2: storage
         self.voltage_rating = 0
         self.power_rating = 0
-        self.power = [0] * 300  # Array of 300 elements for power values (5mins)
+        self.history_length = history_length  # Power values kept (300 = 5mins)
+        self._power = None  # Power history, allocated on first use
+        self._extrema = None  # Rolling min/max of the history, built by the update thread
+        self._power_range = (0, 0)  # Published (min, max); replaced whole, so any thread can read it
+        self.sample_interval = 1  # Seconds between new readings; the last value is held in between
         self.pwm = 0 # Pulse Width Modulation 
         self.fm = 0 # Frequency Modulation
         self.time_operated = 0 # in seconds
         self.energy_used = 0  # Wh
         self.fault = False
+        self.added_from_gui = False  # Not in the fleet configuration; kept by the fleet snapshot
 
         # Additional properties for different appliance types
         # Load properties
@@ -36,12 +44,48 @@ class Appliance:
         # Tracking variables
         self.power_on_time = 0  # Track time when appliance is on
         self.last_update_time = time.time()
+        self.interval_stats = IntervalStats()  # Power statistics since the last export
+
+    @property
+    def power(self):
+        """Power history buffer, allocated the first time it is needed"""
+        if self._power is None:
+            self.power = [0] * self.history_length
+        return self._power
+
+    @power.setter
+    def power(self, values):
+        # Publish the range now (min/max run in C); the rolling min/max itself is
+        # built by the update thread on its next sample, so readers never touch it
+        self._power = values
+        self._extrema = None
+        self._power_range = (min(values), max(values)) if values is not None and len(values) else (0, 0)
+
+    def has_history(self):
+        """True once the power history buffer has been allocated"""
+        return self._power is not None
+
+    def power_range(self):
+        """(min, max) of the power history in O(1); (0, 0) before the buffer is allocated"""
+        return self._power_range
+
+    def _add_extreme(self, value):
+        """Keep the rolling min/max in step with the history and publish it (on the update thread)"""
+        if self._extrema is None:
+            self._extrema = RollingExtrema(len(self._power), self._power)  # Already holds value
+        else:
+            self._extrema.add(value)
+        self._power_range = (self._extrema.minimum, self._extrema.maximum)
 
     def update_power_value(self, new_power_value):
-        # Shift all values left by one position
-        self.power[:-1] = self.power[1:]
-        # Add new value at the end
-        self.power[-1] = new_power_value
+        # An appliance that has only ever read 0 keeps its buffer unallocated
+        if self._power is not None or new_power_value != 0:
+            # Shift all values left by one position
+            self.power[:-1] = self.power[1:]
+            # Add new value at the end
+            self.power[-1] = new_power_value
+            self._add_extreme(new_power_value)
+        self.interval_stats.add(new_power_value)
         
         # Update time operated if appliance is on
         current_time = time.time()
@@ -55,11 +99,20 @@ class Appliance:
         self.last_update_time = current_time
 
     def get_current_power(self): # Instantaneous power 
-        return self.power[-1]
+        return self._power[-1] if self._power is not None else 0
 
     def get_power_history(self): # Return the array
         return self.power.copy()
 
+    def snapshot(self):
+        """Return a detached copy of this appliance for background readers (e.g. exports)."""
+        snap = copy.copy(self)
+        # Snapshots are never updated: copy the buffer and keep the published range as is
+        snap._power = self._power.copy() if self._power is not None else None
+        snap._extrema = None
+        snap.interval_stats = self.interval_stats.copy()
+        return snap
+
     def properties(self):
         return {
             'name': self.name,
@@ -104,7 +157,7 @@ class Appliance:
 
 
 class Appliance_Summary:
-    def __init__(self, name="All", ID=0):
+    def __init__(self, name="All", ID=0, history_length=300):
         self.name = name
         self.ID = ID
         self.type = -1  # Special type for "All"
@@ -117,7 +170,11 @@ class Appliance_Summary:
         self.total_energy_generated = 0     # Total energy generated by all sources
         
         # Power history for summary
-        self.power = [0] * 300  # Array tracking net power (generation - consumption)
+        self.history_length = history_length
+        self._extrema = None  # Rolling min/max of the net power history, built by the update thread
+        self._power_range = (0, 0)  # Published (min, max); replaced whole, so any thread can read it
+        self.power = [0] * self.history_length  # Array tracking net power (generation - consumption)
+        self.interval_stats = IntervalStats()  # Net power statistics since the last export
         
         # Standard properties (for compatibility)
         self.voltage_rating = 240  # System voltage
@@ -132,6 +189,8 @@ class Appliance_Summary:
         self.power[:-1] = self.power[1:]
         # Add new value at the end
         self.power[-1] = net_power
+        self._add_extreme(net_power)
+        self.interval_stats.add(net_power)
         
         # Update summary values
         self.total_power_consumption = consumption
@@ -142,7 +201,41 @@ class Appliance_Summary:
 
     def get_power_history(self):
         return self.power.copy()
-        
+
+    @property
+    def power(self):
+        return self._power
+
+    @power.setter
+    def power(self, values):
+        # Publish the range now; the rolling min/max is built by the update thread
+        self._power = values
+        self._extrema = None
+        self._power_range = (min(values), max(values)) if values is not None and len(values) else (0, 0)
+
+    def power_range(self):
+        """(min, max) of the net power history in O(1)"""
+        return self._power_range
+
+    def _add_extreme(self, value):
+        """Keep the rolling min/max in step with the history and publish it (on the update thread)"""
+        if self._extrema is None:
+            self._extrema = RollingExtrema(len(self._power), self._power)  # Already holds value
+        else:
+            self._extrema.add(value)
+        self._power_range = (self._extrema.minimum, self._extrema.maximum)
+
+    def has_history(self):
+        return True
+
+    def snapshot(self):
+        """Return a detached copy of the summary for background readers (e.g. exports)."""
+        snap = copy.copy(self)
+        # Snapshots are never updated: copy the buffer and keep the published range as is
+        snap._power = self._power.copy()
+        snap._extrema = None
+        snap.interval_stats = self.interval_stats.copy()
+        return snap
 
     def update_from_appliances(self, appliances_dict):
         """Update aggregate values from all individual appliances"""
@@ -0,0 +1,185 @@
+from tkinter import *
+from datetime import timedelta
+import numpy as np
+
+
+class CanvasGraph:
+    """
+    Lightweight live power graph drawn directly on a tkinter Canvas.
+    A matplotlib-free alternative for small panels: each series is a single
+    create_line item whose points are replaced with coords() every tick.
+    Gridlines, axis labels and the legend are only redrawn when the y-range,
+    the minutes inside the time window, the size or the set of series
+    changes; in between, the minute gridlines are just moved with the trace.
+    """
+
+    MARGIN_LEFT = 55
+    MARGIN_RIGHT = 10
+    MARGIN_TOP = 10
+    MARGIN_BOTTOM = 35
+    Y_TICKS = 5
+    FONT = ("TkDefaultFont", 8)
+
+    def __init__(self, master, window_seconds=300, width=400, height=280):
+        """
+        Initialize the canvas graph.
+
+        Args:
+            master: Parent frame
+            window_seconds: Length of the scrolling time window
+            width, height: Initial canvas size in pixels
+        """
+        self.window_seconds = window_seconds
+        self.canvas = Canvas(master, width=width, height=height, bg="white", highlightthickness=0)
+        self.canvas.grid(column=0, row=2, columnspan=3, sticky=NSEW)
+
+        self.width = width
+        self.height = height
+        self.series = {}  # name -> (canvas line item, color)
+        self.show_legend = False
+        self.y_limits = (0, 10)
+        self.time_origin = None
+        self.time_key = None  # (first, last) whole minute inside the window
+        self.labels_origin = None  # time_origin the minute items were drawn for
+        self.x_pixels = None
+
+        self.canvas.bind('<Configure>', self._on_resize)
+        self._layout()
+
+    def _on_resize(self, event):
+        if (event.width, event.height) != (self.width, self.height):
+            self.width, self.height = event.width, event.height
+            self._layout()
+
+    def _layout(self):
+        """Recompute the plot area after a resize and redraw the static parts."""
+        self.plot_left = self.MARGIN_LEFT
+        self.plot_right = max(self.width - self.MARGIN_RIGHT, self.plot_left + 1)
+        self.plot_top = self.MARGIN_TOP
+        self.plot_bottom = max(self.height - self.MARGIN_BOTTOM, self.plot_top + 1)
+        self.x_pixels = None
+        self._draw_grid()
+        self._draw_time_labels()
+        self._draw_legend()
+
+    # Static parts
+    def _draw_grid(self):
+        """Draw the plot frame, horizontal gridlines and y-axis labels."""
+        self.canvas.delete("grid")
+        y_min, y_max = self.y_limits
+        self.canvas.create_rectangle(self.plot_left, self.plot_top, self.plot_right, self.plot_bottom,
+                                     outline="black", tags="grid")
+        for i in range(self.Y_TICKS + 1):
+            value = y_min + (y_max - y_min) * i / self.Y_TICKS
+            y = self._y_pixel(value)
+            if 0 < i < self.Y_TICKS:
+                self.canvas.create_line(self.plot_left, y, self.plot_right, y, fill="#dddddd", tags="grid")
+            self.canvas.create_text(self.plot_left - 4, y, text=f"{value:.0f}", anchor='e',
+                                    font=self.FONT, tags="grid")
+        self.canvas.create_text(12, (self.plot_top + self.plot_bottom) / 2, text="Power (W)", angle=90,
+                                font=self.FONT, tags="grid")
+        self.canvas.tag_lower("grid")
+
+    def _draw_time_labels(self):
+        """Draw vertical gridlines and HH:MM labels on each whole minute of the window."""
+        self.canvas.delete("time")
+        if self.time_origin is None:
+            return
+        self.time_key = self._minutes_in_window(self.time_origin)
+        self.labels_origin = self.time_origin
+        minute, last_minute = self.time_key
+        while minute <= last_minute:
+            x = self._x_pixel((minute - self.time_origin).total_seconds())
+            self.canvas.create_line(x, self.plot_top, x, self.plot_bottom, fill="#dddddd", tags=("time", "minute"))
+            self.canvas.create_text(x, self.plot_bottom + 4, text=minute.strftime('%H:%M'), anchor='n',
+                                    font=self.FONT, tags=("time", "minute"))
+            minute += timedelta(minutes=1)
+        self.canvas.create_text((self.plot_left + self.plot_right) / 2, self.height - 4, text="Time (HH:MM)",
+                                anchor='s', font=self.FONT, tags="time")
+        self.canvas.tag_lower("time")
+
+    def _minutes_in_window(self, origin):
+        """First and last whole minute inside the window ending at origin."""
+        start = origin - timedelta(seconds=self.window_seconds - 1)
+        first = start.replace(second=0, microsecond=0)
+        if first < start:
+            first += timedelta(minutes=1)
+        return first, origin.replace(second=0, microsecond=0)
+
+    def _draw_legend(self):
+        """Draw a compact legend in the top-left corner of the plot."""
+        self.canvas.delete("legend")
+        if not self.show_legend:
+            return
+        y = self.plot_top + 8
+        for name, (_, color) in self.series.items():
+            self.canvas.create_line(self.plot_left + 6, y, self.plot_left + 20, y, fill=color, width=2, tags="legend")
+            self.canvas.create_text(self.plot_left + 24, y, text=name, anchor='w', font=self.FONT, tags="legend")
+            y += 12
+
+    # Updates
+    def set_series(self, colors, show_legend=True):
+        """
+        Match the line items to {name: color}; items are only created or
+        deleted, and the legend redrawn, when the set of series changes.
+        """
+        if list(self.series) == list(colors) and show_legend == self.show_legend and \
+                all(self.series[name][1] == color for name, color in colors.items()):
+            return
+        old_series = self.series
+        self.series = {}
+        for name, color in colors.items():
+            item = old_series.pop(name, (None, None))[0]
+            if item is None:
+                item = self.canvas.create_line(0, 0, 0, 0, width=2, tags="series")
+            self.canvas.itemconfigure(item, fill=color)
+            self.series[name] = (item, color)
+        for item, _ in old_series.values():
+            self.canvas.delete(item)
+        self.show_legend = show_legend
+        self._draw_legend()
+
+    def set_y_limits(self, y_min, y_max):
+        """Change the y-range; the grid is redrawn only when it differs."""
+        if (y_min, y_max) != self.y_limits and y_max > y_min:
+            self.y_limits = (y_min, y_max)
+            self._draw_grid()
+
+    def set_time_origin(self, origin):
+        """
+        Move the time axis to end at origin. The minute gridlines and labels
+        are shifted with the trace; they are only recreated when a minute
+        enters or leaves the window.
+        """
+        self.time_origin = origin
+        if self.labels_origin is None or self._minutes_in_window(origin) != self.time_key:
+            self._draw_time_labels()
+            return
+        shift = (origin - self.labels_origin).total_seconds()
+        if shift:
+            self.canvas.move("minute", self._x_pixel(-shift) - self._x_pixel(0), 0)
+            self.labels_origin = origin
+
+    def update_series(self, name, values):
+        """Replace the points of one line with the newest history (oldest value first)."""
+        item = self.series[name][0]
+        count = len(values)
+        if count < 2:
+            return
+        if self.x_pixels is None or len(self.x_pixels) != count:
+            offsets = np.arange(-count + 1, 1, dtype=float)
+            self.x_pixels = self._x_pixel(offsets)
+        coords = np.empty(2 * count)
+        coords[0::2] = self.x_pixels
+        coords[1::2] = np.clip(self._y_pixel(np.asarray(values, dtype=float)), self.plot_top, self.plot_bottom)
+        self.canvas.coords(item, coords.tolist())
+
+    # Scaling
+    def _x_pixel(self, offset):
+        """Pixel column of a time offset in seconds (0 = now, at the right edge)."""
+        span = self.window_seconds - 1
+        return self.plot_right + (self.plot_right - self.plot_left) * offset / span
+
+    def _y_pixel(self, value):
+        y_min, y_max = self.y_limits
+        return self.plot_bottom - (self.plot_bottom - self.plot_top) * (value - y_min) / (y_max - y_min)
@@ -0,0 +1,171 @@
+import csv
+import gzip
+import os
+from abc import abstractmethod
+from itertools import repeat
+import numpy as np
+from exporter import Exporter
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet/Arrow backends are optional
+    pa = None
+    pq = None
+
+
+class ColumnarExporter(Exporter):
+    """
+    Base class for columnar export backends.
+    Each export writes two tables next to each other in the exports folder:
+    a fleet snapshot (one row per appliance, plus an "All" totals row) and the
+    buffered power history in long form (timestamp, appliance, power).
+    """
+    extension = ""
+
+    def write_export(self, appliances, timestamp):
+        """Write snapshot and history tables and return the snapshot file path."""
+        base_name = f"appliance_data_{timestamp.strftime('%Y%m%d_%H%M')}"
+        snapshot_path = os.path.join(self.export_folder, f"{base_name}_snapshot{self.extension}")
+        history_path = os.path.join(self.export_folder, f"{base_name}_history{self.extension}")
+
+        self._write_snapshot(snapshot_path, self._build_snapshot_columns(appliances, timestamp))
+        names, timestamps, block = self._build_history_block(appliances, timestamp)
+        self._write_history(history_path, names, timestamps, block)
+        return snapshot_path
+
+    def _build_snapshot_columns(self, appliances, timestamp):
+        """Build the fleet snapshot as a dictionary of equal-length columns."""
+        columns = {
+            'export_time': [], 'appliance': [], 'id': [], 'type': [], 'power_status': [],
+            'power_w': [], 'energy_used_wh': [], 'time_operated_s': [],
+            'min_w': [], 'mean_w': [], 'max_w': [], 'p95_w': [],
+        }
+        export_time = timestamp.replace(microsecond=0)
+
+        for name, appliance in appliances.items():
+            if appliance is None:
+                continue
+            if name == "All":
+                # Net power and total energy consumption, as in the Excel totals
+                power = getattr(appliance, 'total_power_consumption', 0) - getattr(appliance, 'total_power_generation', 0)
+                energy = getattr(appliance, 'total_energy_consumption', 0)
+            else:
+                power = self._safe_get_power(appliance)
+                energy = getattr(appliance, 'energy_used', 0)
+
+            columns['export_time'].append(export_time)
+            columns['appliance'].append(name)
+            columns['id'].append(int(getattr(appliance, 'ID', 0)))
+            columns['type'].append(int(getattr(appliance, 'type', 0)))
+            columns['power_status'].append(bool(getattr(appliance, 'power_status', False)))
+            columns['power_w'].append(float(power))
+            columns['energy_used_wh'].append(float(energy))
+            columns['time_operated_s'].append(int(getattr(appliance, 'time_operated', 0)))
+
+            # Interval statistics since the previous export
+            minimum, mean, maximum, p95 = self._safe_get_interval_stats(appliance)
+            columns['min_w'].append(minimum)
+            columns['mean_w'].append(mean)
+            columns['max_w'].append(maximum)
+            columns['p95_w'].append(p95)
+        return columns
+
+    @abstractmethod
+    def _write_snapshot(self, filepath, columns):
+        """Write the snapshot table (a dictionary of equal-length columns)."""
+
+    @abstractmethod
+    def _write_history(self, filepath, names, timestamps, block):
+        """Write the history table in long form (timestamp, appliance, power)."""
+
+
+class CsvExporter(ColumnarExporter):
+    """Gzip-compressed CSV backend. Needs only the standard library."""
+    format_name = "CSV"
+    extension = ".csv.gz"
+
+    def _write_snapshot(self, filepath, columns):
+        """Write the snapshot table as gzip CSV."""
+        rows = zip(*columns.values())
+        self._write_csv(filepath, list(columns.keys()),
+                        ([ts.isoformat(sep=' ')] + list(rest) for ts, *rest in rows))
+
+    def _write_history(self, filepath, names, timestamps, block):
+        """Write the history in long form, one row per (timestamp, appliance)."""
+        def history_rows():
+            for sample_time, values in zip(timestamps, block.tolist()):
+                yield from zip(repeat(sample_time.isoformat(sep=' ')), names, values)
+
+        self._write_csv(filepath, ['timestamp', 'appliance', 'power_w'], history_rows())
+
+    def _write_csv(self, filepath, header, rows):
+        """Write rows to a temporary gzip file and swap it in when complete."""
+        temp_path = filepath + ".tmp"
+        with gzip.open(temp_path, 'wt', newline='', compresslevel=6) as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(header)
+            writer.writerows(rows)
+        os.replace(temp_path, filepath)
+
+
+class ArrowExporter(ColumnarExporter):
+    """Arrow IPC (Feather v2) backend. Requires pyarrow."""
+    format_name = "Arrow"
+    extension = ".arrow"
+
+    def __init__(self, appliances, right_gui):
+        if pa is None:
+            raise ImportError(f"pyarrow is required for {self.format_name} export")
+        super().__init__(appliances, right_gui)
+
+    def _write_snapshot(self, filepath, columns):
+        """Write the snapshot table."""
+        table = pa.table({
+            'export_time': pa.array(np.array(columns['export_time'], dtype='datetime64[s]')),
+            'appliance': pa.array(columns['appliance'], type=pa.string()),
+            'id': pa.array(columns['id'], type=pa.int32()),
+            'type': pa.array(columns['type'], type=pa.int8()),
+            'power_status': pa.array(columns['power_status'], type=pa.bool_()),
+            'power_w': pa.array(columns['power_w'], type=pa.float64()),
+            'energy_used_wh': pa.array(columns['energy_used_wh'], type=pa.float64()),
+            'time_operated_s': pa.array(columns['time_operated_s'], type=pa.int64()),
+            'min_w': pa.array(columns['min_w'], type=pa.float64()),
+            'mean_w': pa.array(columns['mean_w'], type=pa.float64()),
+            'max_w': pa.array(columns['max_w'], type=pa.float64()),
+            'p95_w': pa.array(columns['p95_w'], type=pa.float64()),
+        })
+        self._write_table(table, filepath)
+
+    def _write_history(self, filepath, names, timestamps, block):
+        """Write the history in long form, built from the history block without Python loops."""
+        sample_count, appliance_count = block.shape
+        times = np.array(timestamps, dtype='datetime64[s]')
+        table = pa.table({
+            'timestamp': pa.array(np.repeat(times, appliance_count)),
+            'appliance': pa.DictionaryArray.from_arrays(
+                pa.array(np.tile(np.arange(appliance_count, dtype=np.int32), sample_count)),
+                pa.array(names, type=pa.string())),
+            'power_w': pa.array(block.ravel()),
+        })
+        self._write_table(table, filepath)
+
+    def _write_table(self, table, filepath):
+        """Write a table to a temporary file and swap it in when complete."""
+        temp_path = filepath + ".tmp"
+        with pa.OSFile(temp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(temp_path, filepath)
+
+
+class ParquetExporter(ArrowExporter):
+    """Parquet backend. Requires pyarrow."""
+    format_name = "Parquet"
+    extension = ".parquet"
+
+    def _write_table(self, table, filepath):
+        """Write a table to a temporary Parquet file and swap it in when complete."""
+        temp_path = filepath + ".tmp"
+        pq.write_table(table, temp_path, compression='zstd')
+        os.replace(temp_path, filepath)
@@ -1,13 +1,21 @@
 from tkinter import *
 import threading
 import time
+import os
 from datetime import datetime, timedelta
-from excel_exporter import ExcelExporter
+from exporter import create_exporter
+from export_worker import ExportWorker
+from retention_manager import RetentionManager
+from sample_store import SampleStore
+from sample_log import SampleLog
+from history_query import HistoryQuery
+from fleet_snapshot import FleetSnapshot
 
 
 class DataUpdateManager:
     """Manages the real-time data updates for all appliances"""
-    def __init__(self, appliances, value_generator, left_gui, right_gui):
+    def __init__(self, appliances, value_generator, left_gui, right_gui, export_formats=("xlsx",),
+                 export_options=None, retention_options=None):
         self.appliances = appliances
         self.value_generator = value_generator
         self.left_gui = left_gui
@@ -17,20 +25,76 @@ class DataUpdateManager:
         
         # Give right_gui access to value_generator for settings updates
         self.right_gui.value_generator = value_generator
+        self.right_gui.on_fleet_changed = self.request_fleet_snapshot
         
-        # Excel export functionality
-        self.excel_exporter = ExcelExporter(appliances, right_gui)
+        # Export functionality (Excel by default, columnar formats optional);
+        # export_options maps a format name to keyword options for its backend
+        export_options = export_options or {}
+        self.exporters = []
+        for export_format in export_formats:
+            try:
+                self.exporters.append(create_exporter(export_format, appliances, right_gui,
+                                                      **export_options.get(export_format, {})))
+            except ImportError as e:
+                # Optional backend without its library: keep running with the others
+                self.right_gui.log_events(f"{export_format} export disabled: {e}")
+        self.export_worker = ExportWorker(self.exporters, left_gui.root, self._on_export_complete)
+        
+        # Per-second persistence of every sample: queryable SQLite store and crash-safe log
+        self.sample_store = SampleStore()
+        self.sample_log = SampleLog()
+        self.sample_sinks = [self.sample_store, self.sample_log]
+        
+        # Background archiving/cleanup of old exports and stored samples;
+        # retention_options holds the age limit and disk ceiling
+        export_folders = {exporter.export_folder for exporter in self.exporters} or {"exports"}
+        self.retention_manager = RetentionManager(export_folders, sample_db=self.sample_store.db_path,
+                                                  sample_log_folder=self.sample_log.log_folder,
+                                                  **(retention_options or {}))
+        
+        # Downsampled time-range queries over the stored history
+        self.history_query = HistoryQuery(self.sample_store.db_path)
+        
+        # Periodic binary snapshot of the fleet configuration, counters and buffers
+        self.fleet_snapshot = FleetSnapshot()
         self.last_export_time = None
+        self.tick_count = 0
+        self.last_power_status = {}  # name -> power_status at the previous tick
+        
+        # GUI redraw scheduling: skip unchanged frames, idle while the window is hidden
+        self.gui_visible = True
+        self.idle_gui_interval = 10  # Ticks between GUI updates while hidden
+        self.last_graph_signature = None
+        self.last_panel_signature = None
+        left_gui.root.bind('<Map>', self._on_window_visibility, add='+')
+        left_gui.root.bind('<Unmap>', self._on_window_visibility, add='+')
         
     def start_updates(self):
         """Start the data update thread"""
         self.running = True
+        self.export_worker.start()
+        self.retention_manager.start()
+        for sink in self.sample_sinks:
+            sink.start()
+        self.fleet_snapshot.start()
         self.update_thread = threading.Thread(target=self._update_loop, daemon=True)
         self.update_thread.start()
         
     def stop_updates(self):
         """Stop the data update thread"""
         self.running = False
+        self.export_worker.stop()
+        self.retention_manager.stop()
+        for sink in self.sample_sinks:
+            sink.stop()
+        self.history_query.close()
+        
+        # Final snapshot on shutdown, written synchronously
+        self.fleet_snapshot.stop()
+        try:
+            self.fleet_snapshot.save(self._snapshot_appliances(), dict(self.value_generator.variation_percent))
+        except OSError as e:
+            print(f"Error writing fleet snapshot: {e}")
         
     def _update_loop(self):
         """Main update loop that runs every second"""
@@ -42,6 +106,14 @@ class DataUpdateManager:
                 for name, appliance in self.appliances.items():
                     if name == "All" or appliance is None:
                         continue
+                    
+                    # Take a new reading every sample_interval seconds and hold it in between,
+                    # except right after the appliance is switched on or off
+                    status_changed = self.last_power_status.get(name) != appliance.power_status
+                    self.last_power_status[name] = appliance.power_status
+                    if not status_changed and self.tick_count % max(1, int(appliance.sample_interval)):
+                        appliance.update_power_value(appliance.get_current_power())
+                        continue
                         
                     # Generate new power value (pass appliance object so it can check current ratings)
                     new_power = self.value_generator.generate_value(name, appliance, appliance.power_status)
@@ -54,18 +126,38 @@ class DataUpdateManager:
                     summary.update_power_value(consumption, generation)
                     summary.update_from_appliances(self.appliances)
                 
+                # Queue this tick's samples for the persistent stores
+                samples = self._collect_samples()
+                for sink in self.sample_sinks:
+                    sink.record_tick(current_time, samples)
+                
                 # Check if it's time to export (every 5 minutes at :00, :05, :10, etc.)
                 self.check_and_export(current_time)
                 
-                # Update GUI in main thread
-                self.left_gui.root.after(0, self._update_gui)
+                # Periodic fleet snapshot
+                if self.fleet_snapshot.is_due(current_time):
+                    self.fleet_snapshot.submit(self._snapshot_appliances(),
+                                               dict(self.value_generator.variation_percent), current_time)
+                
+                # Update GUI in main thread (only occasionally while the window is hidden)
+                if self.gui_visible or self.tick_count % self.idle_gui_interval == 0:
+                    self.left_gui.root.after(0, self._update_gui, time.perf_counter())
                 
                 # Wait for 1 second
+                self.tick_count += 1
                 time.sleep(1)
                 
             except Exception as e:
                 print(f"Error in update loop: {e}")
     
+    def _collect_samples(self):
+        """Collect (ID, name, latest power) for every appliance, including the summary"""
+        samples = []
+        for name, appliance in list(self.appliances.items()):
+            if appliance is not None:
+                samples.append((appliance.ID, name, appliance.get_current_power()))
+        return samples
+    
     def check_and_export(self, current_time):
         """Check if it's time to export data (every 5 minutes)"""
         try:
@@ -77,32 +169,84 @@ class DataUpdateManager:
                     
                     self.last_export_time = current_time
                     
-                    # Schedule export in main thread to avoid GUI conflicts
-                    self.left_gui.root.after(0, self._perform_export)
+                    # Snapshot on the update thread, between ticks, so totals and
+                    # per-appliance rows all come from the same tick
+                    snapshot = self._snapshot_appliances()
+                    self.export_worker.submit(snapshot, current_time)
+                    
+                    # Start a new statistics window for the next interval
+                    self._reset_interval_stats()
                     
         except Exception as e:
             print(f"Error checking export time: {e}")
     
-    def _perform_export(self):
-        """Perform the actual export"""
+    def request_fleet_snapshot(self):
+        """Write a fleet snapshot on the next tick (after an appliance is added or reconfigured)"""
+        self.fleet_snapshot.last_save_time = None
+    
+    def _snapshot_appliances(self):
+        """Take a detached copy of every appliance for a background export"""
+        snapshot = {}
+        for name, appliance in list(self.appliances.items()):
+            snapshot[name] = appliance.snapshot() if appliance is not None else None
+        return snapshot
+    
+    def _reset_interval_stats(self):
+        """Reset every appliance's interval statistics at an export boundary"""
+        for appliance in list(self.appliances.values()):
+            if appliance is not None and hasattr(appliance, 'interval_stats'):
+                appliance.interval_stats.reset()
+    
+    def _on_export_complete(self, success, filepath, error):
+        """Handle export completion (runs on the GUI thread)"""
         try:
-            success = self.excel_exporter.export_data()
             if success:
-                print(f"Excel export completed at {datetime.now().strftime('%H:%M:%S')}")
+                filename = os.path.basename(filepath)
+                self.right_gui.log_events(f"Power data exported to {filename}")
+                print(f"Export completed at {datetime.now().strftime('%H:%M:%S')}")
             else:
-                print(f"Excel export failed at {datetime.now().strftime('%H:%M:%S')}")
+                self.right_gui.log_events(f"Export failed: {error}")
+                print(f"Export failed at {datetime.now().strftime('%H:%M:%S')}: {error}")
         except Exception as e:
             print(f"Error during export: {e}")
                 
-    def _update_gui(self):
-        """Update GUI elements"""
+    def _on_window_visibility(self, event):
+        """Track minimize/restore of the main window (runs on the GUI thread)"""
+        if event.widget is not self.left_gui.root:
+            return  # Map/Unmap of child widgets
+        self.gui_visible = event.type == EventType.Map
+        if self.gui_visible:
+            # Redraw everything immediately on restore
+            self.last_graph_signature = None
+            self.last_panel_signature = None
+            self._update_gui()
+    
+    def _update_gui(self, tick_time=None):
+        """Update GUI elements that changed since the last update (tick_time: perf_counter of the data tick)"""
         try:
-            # Refresh the graph for currently displayed appliance
-            self.left_gui.refresh_current_graph()
+            # Nothing is drawn while the window is minimized or hidden
+            self.gui_visible = bool(self.left_gui.root.winfo_viewable())
+            if not self.gui_visible:
+                return
+            
+            # Refresh the graph for currently displayed appliance; when it would look
+            # the same, only scroll its time axis
+            graph_signature = self.left_gui.graph_signature()
+            if graph_signature is None or graph_signature != self.last_graph_signature:
+                self.left_gui.refresh_current_graph()
+                self.last_graph_signature = graph_signature
+                if self.left_gui.render_monitor is not None and tick_time is not None:
+                    self.left_gui.render_monitor.track_latency(tick_time)
+            else:
+                self.left_gui.scroll_graph()
             
-            # Update properties display for current appliance
-            if hasattr(self.left_gui, 'current_appliance') and self.left_gui.current_appliance:
-                self.left_gui.update_appliance_display(self.left_gui.current_appliance)
+            # Update properties display for current appliance when its values changed
+            appliance = getattr(self.left_gui, 'current_appliance', None)
+            if appliance:
+                panel_signature = (id(appliance), tuple(appliance.properties().values()))
+                if panel_signature != self.last_panel_signature:
+                    self.left_gui.update_appliance_display(appliance)
+                    self.last_panel_signature = panel_signature
             
             # Update settings display if visible
             self.update_settings_display()
@@ -1,127 +1,242 @@
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.utils import get_column_letter
 from datetime import datetime
+from exporter import Exporter
+import csv
 import os
+import re
 
+# openpyxl is slow to import, so it is loaded by the first export rather than at start-up
+openpyxl = None
+Font = PatternFill = Alignment = get_column_letter = WriteOnlyCell = None
 
-class ExcelExporter:
+
+def _import_openpyxl():
+    """Import openpyxl into this module the first time a workbook is written."""
+    global openpyxl, Font, PatternFill, Alignment, get_column_letter, WriteOnlyCell
+    if openpyxl is None:
+        from openpyxl.styles import Font, PatternFill, Alignment
+        from openpyxl.utils import get_column_letter
+        from openpyxl.cell import WriteOnlyCell
+        import openpyxl as module
+        openpyxl = module
+
+
+def read_last_index_entry(index_path):
+    """Read the header and last line of a daily side index without reading the whole file."""
+    if not os.path.exists(index_path):
+        return None
+    with open(index_path, 'rb') as index_file:
+        header = index_file.readline().decode().strip().split(',')
+        index_file.seek(0, os.SEEK_END)
+        size = index_file.tell()
+        index_file.seek(max(0, size - 512))
+        lines = index_file.read().decode().strip().splitlines()
+    if not lines or lines[-1].startswith(header[0]):
+        return None
+    return dict(zip(header, lines[-1].split(',')))
+
+
+def read_segment_tail(segment_path, after, chunk_size=65536):
+    """
+    Return the rows of a daily CSV segment whose first column (a
+    'YYYY-MM-DD HH:MM:SS' time) is later than after, reading backwards from
+    the end so only the tail of the file is touched. after="" returns every row.
+    """
+    if not os.path.exists(segment_path):
+        return []
+    with open(segment_path, 'rb') as segment_file:
+        segment_file.seek(0, os.SEEK_END)
+        position = segment_file.tell()
+        data = b""
+        while position > 0:
+            position = max(0, position - chunk_size)
+            segment_file.seek(position)
+            data = segment_file.read(chunk_size) + data
+            # Stop once the first complete line in the buffer is old enough
+            lines = data.split(b"\n", 2)
+            if position > 0 and len(lines) > 2 and lines[1][:19].decode(errors='replace') <= after:
+                break
+    lines = data.decode(errors='replace').splitlines()
+    if position > 0:
+        lines = lines[1:]  # First line may be partial
+    rows = [row for row in csv.reader(lines) if row and row[0] != "Timestamp" and row[0] != "Export Time"]
+    return [row for row in rows if row[0] > after]
+
+
+class SheetWriter:
+    """
+    Builds a write-only worksheet from cells addressed by (row, column),
+    tracking the widest value per column as they are written.
+    Cells are held until finish(), which sets the column widths and then
+    streams the rows in order, as a write-only sheet requires.
+    Merged regions are declared when written and never count towards a width.
+    """
+    
+    def __init__(self, sheet):
+        self.sheet = sheet
+        self.rows = {}  # row index -> {column index: cell}
+        self.widths = {}  # column index -> longest string length seen
+    
+    def write(self, row, column, value):
+        """Write a single cell and record its display width."""
+        cell = WriteOnlyCell(self.sheet, value=value)
+        self.rows.setdefault(row, {})[column] = cell
+        length = len(str(value)) if value is not None and value != "" else 0
+        if length > self.widths.get(column, 0):
+            self.widths[column] = length
+        else:
+            self.widths.setdefault(column, 0)
+        return cell
+    
+    def write_merged(self, row, start_column, end_column, value):
+        """Write a value into a merged row region (excluded from width tracking)."""
+        cell = WriteOnlyCell(self.sheet, value=value)
+        self.rows.setdefault(row, {})[start_column] = cell
+        self.sheet.merged_cells.add(f"{get_column_letter(start_column)}{row}:{get_column_letter(end_column)}{row}")
+        for column in range(start_column, end_column + 1):
+            self.widths.setdefault(column, 0)
+        return cell
+    
+    def finish(self):
+        """Set column widths from the tracked maxima, then write the rows."""
+        for column, max_length in self.widths.items():
+            adjusted_width = min(max_length + 2, 25) if max_length > 0 else 12
+            self.sheet.column_dimensions[get_column_letter(column)].width = adjusted_width
+        for row in range(1, max(self.rows, default=0) + 1):
+            cells = self.rows.get(row, {})
+            self.sheet.append([cells.get(column) for column in range(1, max(cells, default=0) + 1)])
+
+
+class ExcelExporter(Exporter):
     """
     Simplified Excel export utility focused on power consumption data.
     Creates concise Excel reports with essential power data only.
+    In daily mode each export is appended to plain CSV segments, and the day's
+    workbook is written from them once the day is over.
     """
+    format_name = "Excel"
     
-    def __init__(self, appliances, right_gui):
-        """Initialize the Excel exporter."""
-        self.appliances = appliances
-        self.right_gui = right_gui
-        self.export_folder = "exports"
-        
-        # Create exports directory if it doesn't exist
-        if not os.path.exists(self.export_folder):
-            os.makedirs(self.export_folder)
-    
-    def export_data(self):
-        """Export power consumption data to Excel file."""
-        try:
-            # Generate filename with timestamp
-            timestamp = datetime.now()
-            filename = f"appliance_data_{timestamp.strftime('%Y%m%d_%H%M')}.xlsx"
-            filepath = os.path.join(self.export_folder, filename)
-            
-            # Create workbook
-            workbook = openpyxl.Workbook()
-            sheet = workbook.active
-            sheet.title = "Power Data"
-            
-            # Create the simplified report
-            self._create_power_report(sheet, timestamp)
-            
-            # Save file
-            workbook.save(filepath)
-            
-            # Log success
-            if hasattr(self.right_gui, 'log_events'):
-                self.right_gui.log_events(f"Power data exported to {filename}")
-            
-            print(f"Excel file exported: {filepath}")
-            return True
-            
-        except Exception as e:
-            # Log error
-            error_msg = f"Export failed: {str(e)}"
-            if hasattr(self.right_gui, 'log_events'):
-                self.right_gui.log_events(error_msg)
-            print(error_msg)
-            return False
-    
-    def _create_power_report(self, sheet, timestamp):
+    DAILY_HEADERS = ["Export Time", "Appliance", "Status", "Power (W)", "Energy Used (Wh)",
+                     "Time Operated (s)", "Min (W)", "Mean (W)", "Max (W)", "P95 (W)"]
+    SEGMENT_SUFFIX = ".segment.csv"
+    DATA_SEGMENT_PATTERN = re.compile(r"^appliance_data_(\d{8})_data\.segment\.csv$")
+    
+    def __init__(self, appliances, right_gui, history_mode="recent", file_mode="interval"):
+        """
+        Initialize the Excel exporter.
+        
+        Args:
+            appliances: Dictionary of appliances to export
+            right_gui: GUI component used for event logging
+            history_mode: "recent" for the last 10 readings only, "full" to also
+                write every buffered sample to a "Power History" sheet
+            file_mode: "interval" for a new workbook per export, "daily" to append
+                each export to one workbook per day
+        """
+        super().__init__(appliances, right_gui)
+        self.history_mode = history_mode
+        self.file_mode = file_mode
+        
+        # Day currently being appended to and its workbook row counts so far
+        self.daily_date = None
+        self.daily_data_rows = 0
+        self.daily_history_rows = 0
+        self.daily_history_end = None  # Timestamp of the last history sample written
+
+    def write_export(self, appliances, timestamp):
+        """Write an Excel report for the given appliances and return the file path."""
+        _import_openpyxl()
+        if self.file_mode == "daily":
+            return self._write_daily_export(appliances, timestamp)
+        
+        filename = f"appliance_data_{timestamp.strftime('%Y%m%d_%H%M')}.xlsx"
+        filepath = os.path.join(self.export_folder, filename)
+        
+        # Write-only workbook: rows are streamed to the file, so a full history costs no cell objects
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet("Power Data")
+        
+        # Create the simplified report
+        self._create_power_report(sheet, timestamp, appliances)
+        
+        # Full-resolution history goes on its own sheet
+        if self.history_mode == "full":
+            history_sheet = workbook.create_sheet("Power History")
+            self._add_full_power_history(history_sheet, timestamp, appliances)
+        
+        # Save atomically so readers never see a half-written workbook
+        temp_path = filepath + ".tmp"
+        workbook.save(temp_path)
+        os.replace(temp_path, filepath)
+        return filepath
+    
+    def _create_power_report(self, sheet, timestamp, appliances):
         """Create a concise power consumption report."""
+        writer = SheetWriter(sheet)
+        
         # Setup styling
         header_font = Font(bold=True, color="FFFFFF")
         header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
         center_align = Alignment(horizontal="center", vertical="center")
         
         # Title and timestamp
-        sheet['A1'] = "Power Consumption Report"
-        sheet['A1'].font = Font(bold=True, size=16)
-        sheet.merge_cells('A1:E1')
-        
-        sheet['A2'] = f"Export Time: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}"
-        sheet['A2'].font = Font(bold=True)
-        sheet.merge_cells('A2:E2')
+        writer.write_merged(1, 1, 5, "Power Consumption Report").font = Font(bold=True, size=16)
+        writer.write_merged(2, 1, 5, f"Export Time: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}").font = Font(bold=True)
         
         # System totals section
-        self._add_system_totals(sheet)
+        self._add_system_totals(writer, appliances)
         
         # Individual appliances section
-        self._add_individual_appliances(sheet, header_font, header_fill, center_align)
+        self._add_individual_appliances(writer, appliances, header_font, header_fill, center_align)
         
         # Power history section (last 10 readings for brevity)
-        self._add_recent_power_history(sheet, header_font, header_fill, center_align)
+        self._add_recent_power_history(writer, appliances, header_font, header_fill, center_align)
         
-        # Auto-adjust column widths
-        self._auto_adjust_columns(sheet)
+        # Column widths were tracked while writing
+        writer.finish()
     
-    def _add_system_totals(self, sheet):
+    def _add_system_totals(self, writer, appliances):
         """Add system-wide power totals."""
-        sheet['A4'] = "System Totals"
-        sheet['A4'].font = Font(bold=True, size=14)
+        writer.write(4, 1, "System Totals").font = Font(bold=True, size=14)
         
-        if "All" in self.appliances and self.appliances["All"]:
-            summary = self.appliances["All"]
+        if "All" in appliances and appliances["All"]:
+            summary = appliances["All"]
             total_consumption = getattr(summary, 'total_power_consumption', 0)
             total_generation = getattr(summary, 'total_power_generation', 0)
             net_power = total_consumption - total_generation
             
-            sheet['A5'] = "Total Power Consumption:"
-            sheet['B5'] = f"{total_consumption:.1f} W"
-            sheet['A6'] = "Total Power Generation:"
-            sheet['B6'] = f"{total_generation:.1f} W"
-            sheet['A7'] = "Net Power:"
-            sheet['B7'] = f"{net_power:.1f} W"
+            totals = [
+                ("Total Power Consumption:", f"{total_consumption:.1f} W"),
+                ("Total Power Generation:", f"{total_generation:.1f} W"),
+                ("Net Power:", f"{net_power:.1f} W"),
+            ]
+            
+            # Net power over the export interval, from the summary's streaming statistics
+            minimum, mean, maximum, p95 = self._safe_get_interval_stats(summary)
+            if mean is not None:
+                totals.append(("Net Power (interval):",
+                               f"min {minimum:.1f} / mean {mean:.1f} / max {maximum:.1f} / p95 {p95:.1f} W"))
             
-            # Bold labels
-            for row in [5, 6, 7]:
-                sheet[f'A{row}'].font = Font(bold=True)
+            for row, (label, value) in enumerate(totals, 5):
+                writer.write(row, 1, label).font = Font(bold=True)
+                writer.write(row, 2, value)
     
-    def _add_individual_appliances(self, sheet, header_font, header_fill, center_align):
+    def _add_individual_appliances(self, writer, appliances, header_font, header_fill, center_align):
         """Add individual appliance power data."""
         start_row = 9
-        sheet[f'A{start_row}'] = "Individual Appliances"
-        sheet[f'A{start_row}'].font = Font(bold=True, size=14)
+        writer.write(start_row, 1, "Individual Appliances").font = Font(bold=True, size=14)
         
         # Headers
-        headers = ["Appliance", "Status", "Current Power (W)", "Energy Used (kWh)"]
+        headers = ["Appliance", "Status", "Current Power (W)", "Energy Used (kWh)", "Time Operated (s)",
+                   "Min (W)", "Mean (W)", "Max (W)", "P95 (W)"]
         for col, header in enumerate(headers, 1):
-            cell = sheet.cell(row=start_row + 2, column=col, value=header)
+            cell = writer.write(start_row + 2, col, header)
             cell.font = header_font
             cell.fill = header_fill
             cell.alignment = center_align
         
         # Data rows
         row = start_row + 3
-        for name, appliance in self.appliances.items():
+        for name, appliance in appliances.items():
             if name == "All" or appliance is None:
                 continue
                 
@@ -132,13 +247,18 @@ class ExcelExporter:
                 energy_used = getattr(appliance, 'energy_used', 0)
                 
                 # Add to sheet
-                sheet.cell(row=row, column=1, value=name)
-                sheet.cell(row=row, column=2, value=status)
-                sheet.cell(row=row, column=3, value=f"{current_power:.1f}")
-                sheet.cell(row=row, column=4, value=f"{energy_used:.3f}")
+                writer.write(row, 1, name)
+                status_cell = writer.write(row, 2, status)
+                writer.write(row, 3, f"{current_power:.1f}")
+                writer.write(row, 4, f"{energy_used:.3f}")
+                writer.write(row, 5, int(getattr(appliance, 'time_operated', 0)))
+                
+                # Interval statistics since the previous export
+                for col, value in enumerate(self._safe_get_interval_stats(appliance), 6):
+                    if value is not None:
+                        writer.write(row, col, round(value, 1)).number_format = '0.0'
                 
                 # Color code status
-                status_cell = sheet.cell(row=row, column=2)
                 if status == "ON":
                     status_cell.fill = PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid")
                 else:
@@ -149,95 +269,265 @@ class ExcelExporter:
             except Exception as e:
                 print(f"Error processing appliance {name}: {e}")
     
-    def _add_recent_power_history(self, sheet, header_font, header_fill, center_align):
+    def _add_recent_power_history(self, writer, appliances, header_font, header_fill, center_align):
         """Add recent power history (last 10 readings) for each appliance."""
         # Calculate starting row
-        appliance_count = len([a for name, a in self.appliances.items() if name != "All" and a is not None])
+        appliance_count = len([a for name, a in appliances.items() if name != "All" and a is not None])
         start_row = 12 + appliance_count + 2
         
-        sheet[f'A{start_row}'] = "Recent Power History (Last 10 Readings)"
-        sheet[f'A{start_row}'].font = Font(bold=True, size=14)
+        writer.write(start_row, 1, "Recent Power History (Last 10 Readings)").font = Font(bold=True, size=14)
         
         # Create headers with appliance names
-        headers = ["Time Index"] + [name for name, a in self.appliances.items() if name != "All" and a is not None]
+        headers = ["Time Index"] + [name for name, a in appliances.items() if name != "All" and a is not None]
         for col, header in enumerate(headers, 1):
-            cell = sheet.cell(row=start_row + 2, column=col, value=header)
+            cell = writer.write(start_row + 2, col, header)
             cell.font = header_font
             cell.fill = header_fill
             cell.alignment = center_align
         
+        # Fetch each history once rather than once per row
+        histories = [self._safe_get_history(a) for name, a in appliances.items() if name != "All" and a is not None]
+        
         # Add last 10 power readings
         for i in range(10):
             row = start_row + 3 + i
-            sheet.cell(row=row, column=1, value=f"T-{9-i}")  # Time index (T-9, T-8, ..., T-0)
+            writer.write(row, 1, f"T-{9-i}")  # Time index (T-9, T-8, ..., T-0)
             
-            col = 2
-            for name, appliance in self.appliances.items():
-                if name == "All" or appliance is None:
-                    continue
-                    
-                # Get power history safely
-                power_history = self._safe_get_history(appliance)
+            for col, power_history in enumerate(histories, 2):
                 if power_history and len(power_history) > (9-i):
                     power_value = power_history[-(10-i)]  # Get value from end of array
                 else:
                     power_value = 0
                     
-                sheet.cell(row=row, column=col, value=f"{power_value:.1f}")
-                col += 1
-    
-    def _safe_get_power(self, appliance):
-        """Safely get current power from appliance."""
-        try:
-            if hasattr(appliance, 'get_current_power'):
-                return appliance.get_current_power()
-            return 0
-        except:
-            return 0
-    
-    def _safe_get_history(self, appliance):
-        """Safely get power history from appliance."""
-        try:
-            if hasattr(appliance, 'get_power_history'):
-                return appliance.get_power_history()
-            return [0] * 300
-        except:
-            return [0] * 300
-    
-    def _auto_adjust_columns(self, sheet):
-        """Auto-adjust column widths."""
-        try:
-            # Get the actual range of columns used
-            max_col = sheet.max_column
-            
-            for col_num in range(1, max_col + 1):
-                max_length = 0
-                column_letter = get_column_letter(col_num)
-                
-                # Check all cells in this column
-                for row_num in range(1, sheet.max_row + 1):
-                    cell = sheet.cell(row=row_num, column=col_num)
-                    
-                    # Skip merged cells by checking if the cell is part of a merged range
-                    is_merged = False
-                    for merged_range in sheet.merged_cells.ranges:
-                        if cell.coordinate in merged_range:
-                            is_merged = True
-                            break
-                    
-                    if is_merged:
-                        continue
-                        
-                    try:
-                        if cell.value and len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                
-                # Set adjusted width
-                adjusted_width = min(max_length + 2, 25) if max_length > 0 else 12
-                sheet.column_dimensions[column_letter].width = adjusted_width
-                
-        except Exception as e:
-            print(f"Error in auto-adjust columns: {e}")
-            # Don't fail the whole export if column adjustment fails
\ No newline at end of file
+                writer.write(row, col, f"{power_value:.1f}")
+    
+    def _add_full_power_history(self, sheet, timestamp, appliances):
+        """
+        Add the complete buffered power history as a numeric block:
+        one timestamp column followed by one column per appliance.
+        Rows are streamed into the write-only sheet as they are built.
+        """
+        names, timestamps, block = self._build_history_block(appliances, timestamp)
+        
+        sheet.column_dimensions['A'].width = 20
+        sheet.freeze_panes = "B2"
+        header_font = Font(bold=True)
+        sheet.append([self._header_cell(sheet, header, header_font) for header in ["Timestamp"] + names])
+        for sample_time, values in zip(timestamps, block.tolist()):
+            sheet.append([sample_time] + values)
+    
+    # Daily append mode
+    def _write_daily_export(self, appliances, timestamp):
+        """
+        Append this interval to the day's CSV segments and record where it will
+        sit in the day's workbook in the side index. Appending costs the same at
+        23:55 as at 00:05; the workbook is built once, when the day is finished.
+        Returns the data segment path.
+        """
+        day = timestamp.strftime('%Y%m%d')
+        if day != self.daily_date:
+            # First export of a new day (or since start-up): build finished days' workbooks
+            self._roll_up_finished_days(day)
+            self._resume_daily_segments(day)
+        base_path = os.path.join(self.export_folder, f"appliance_data_{day}")
+        data_path = base_path + "_data" + self.SEGMENT_SUFFIX
+        
+        # Append one row per appliance plus the system totals
+        rows = self._build_interval_rows(appliances, timestamp)
+        data_first_row = self.daily_data_rows + 1
+        self._append_segment(data_path, self.DAILY_HEADERS, rows)
+        self.daily_data_rows += len(rows)
+        
+        # Append only history samples not already written today
+        history_first_row, history_rows = 0, 0
+        if self.history_mode == "full":
+            history_first_row = self.daily_history_rows + 1
+            history_rows = self._append_daily_history(base_path + "_history" + self.SEGMENT_SUFFIX,
+                                                      appliances, timestamp)
+            self.daily_history_rows += history_rows
+        
+        self._append_index_entry(base_path + ".xlsx", timestamp, data_first_row, len(rows),
+                                 history_first_row, history_rows)
+        return data_path
+    
+    def _resume_daily_segments(self, day):
+        """
+        Pick up the row counts of a day already partly exported (after a restart)
+        from the side index, plus any segment rows written after its last entry.
+        """
+        base_path = os.path.join(self.export_folder, f"appliance_data_{day}")
+        self.daily_date = day
+        self.daily_data_rows = 1  # Header row
+        self.daily_history_rows = 1
+        self.daily_history_end = None
+        
+        last_export = ""
+        last_entry = read_last_index_entry(base_path + "_index.csv")
+        if last_entry is not None:
+            last_export = last_entry['export_time']
+            self.daily_data_rows = int(last_entry['data_first_row']) + int(last_entry['data_rows']) - 1
+            if int(last_entry['history_rows'] or 0):
+                self.daily_history_rows = int(last_entry['history_first_row']) + int(last_entry['history_rows']) - 1
+        
+        self.daily_data_rows += len(read_segment_tail(base_path + "_data" + self.SEGMENT_SUFFIX, last_export))
+        history_tail = read_segment_tail(base_path + "_history" + self.SEGMENT_SUFFIX, last_export)
+        self.daily_history_rows += len({row[0] for row in history_tail})
+        if history_tail:
+            self.daily_history_end = datetime.strptime(history_tail[-1][0], '%Y-%m-%d %H:%M:%S')
+        elif last_entry is not None and int(last_entry['history_rows'] or 0):
+            self.daily_history_end = datetime.strptime(last_export, '%Y-%m-%d %H:%M:%S')
+    
+    def _build_interval_rows(self, appliances, timestamp):
+        """Build numeric data rows for one export interval."""
+        export_time = timestamp.replace(microsecond=0)
+        rows = []
+        
+        for name, appliance in appliances.items():
+            if name == "All" or appliance is None:
+                continue
+            status = "ON" if getattr(appliance, 'power_status', False) else "OFF"
+            rows.append([export_time, name, status,
+                         self._safe_get_power(appliance),
+                         getattr(appliance, 'energy_used', 0),
+                         int(getattr(appliance, 'time_operated', 0)),
+                         *self._safe_get_interval_stats(appliance)])
+        
+        # System totals as an "All" row (net power and total energy consumption)
+        if "All" in appliances and appliances["All"]:
+            summary = appliances["All"]
+            net_power = getattr(summary, 'total_power_consumption', 0) - getattr(summary, 'total_power_generation', 0)
+            rows.append([export_time, "All", "", net_power,
+                         getattr(summary, 'total_energy_consumption', 0),
+                         int(getattr(summary, 'time_operated', 0)),
+                         *self._safe_get_interval_stats(summary)])
+        return rows
+    
+    def _append_daily_history(self, segment_path, appliances, timestamp):
+        """
+        Append new history samples to the day's history segment in long form
+        (timestamp, appliance, power), so appliances added during the day need
+        no header change. Returns the number of new sample times written.
+        """
+        names, timestamps, block = self._build_history_block(appliances, timestamp)
+        
+        # Skip samples already covered by a previous export today
+        start = 0
+        if self.daily_history_end is not None:
+            while start < len(timestamps) and timestamps[start] <= self.daily_history_end:
+                start += 1
+        
+        rows = ([sample_time, name, value]
+                for sample_time, values in zip(timestamps[start:], block[start:].tolist())
+                for name, value in zip(names, values))
+        self._append_segment(segment_path, ["Timestamp", "Appliance", "Power (W)"], rows)
+        
+        if start < len(timestamps):
+            self.daily_history_end = timestamps[-1]
+        return len(timestamps) - start
+    
+    def _append_segment(self, segment_path, header, rows):
+        """Append rows to a CSV segment, writing the header when the segment is new."""
+        new_segment = not os.path.exists(segment_path)
+        with open(segment_path, "a", newline='') as segment_file:
+            writer = csv.writer(segment_file)
+            if new_segment:
+                writer.writerow(header)
+            writer.writerows(rows)
+    
+    def _roll_up_finished_days(self, today):
+        """Build the workbook of every day before today that still has segments."""
+        for filename in sorted(os.listdir(self.export_folder)):
+            match = self.DATA_SEGMENT_PATTERN.match(filename)
+            if match and match.group(1) < today:
+                try:
+                    self._roll_up_day(match.group(1))
+                except (OSError, ValueError) as e:
+                    print(f"Error building daily workbook for {match.group(1)}: {e}")
+    
+    def _roll_up_day(self, day):
+        """
+        Stream a finished day's segments into its workbook with a write-only
+        workbook (rows are never held in memory), then delete the segments.
+        The segments stay the source of truth until the workbook is swapped in,
+        so an interrupted roll-up is simply redone.
+        """
+        base_path = os.path.join(self.export_folder, f"appliance_data_{day}")
+        data_path = base_path + "_data" + self.SEGMENT_SUFFIX
+        history_path = base_path + "_history" + self.SEGMENT_SUFFIX
+        
+        workbook = openpyxl.Workbook(write_only=True)
+        data_sheet = workbook.create_sheet("Power Data")
+        for col, header in enumerate(self.DAILY_HEADERS, 1):
+            data_sheet.column_dimensions[get_column_letter(col)].width = max(len(header) + 2, 20 if col == 1 else 12)
+        data_sheet.freeze_panes = "A2"
+        header_font = Font(bold=True, color="FFFFFF")
+        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        data_sheet.append([self._header_cell(data_sheet, header, header_font, header_fill)
+                           for header in self.DAILY_HEADERS])
+        with open(data_path, newline='') as segment_file:
+            reader = csv.reader(segment_file)
+            next(reader)  # Header
+            for row in reader:
+                data_sheet.append([datetime.strptime(row[0], '%Y-%m-%d %H:%M:%S'), row[1], row[2]] +
+                                  [float(value) if value else None for value in row[3:]])
+        
+        if os.path.exists(history_path):
+            self._roll_up_history(workbook, history_path)
+        
+        filepath = base_path + ".xlsx"
+        temp_path = filepath + ".tmp"
+        workbook.save(temp_path)
+        os.replace(temp_path, filepath)
+        for path in (data_path, history_path):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    def _roll_up_history(self, workbook, history_path):
+        """Pivot the long-form history segment into one row per sample time, one column per appliance."""
+        # First pass: the appliance columns, in the order they first appear
+        columns = {}
+        with open(history_path, newline='') as segment_file:
+            reader = csv.reader(segment_file)
+            next(reader)
+            for _, name, _ in reader:
+                if name not in columns:
+                    columns[name] = len(columns)
+        
+        sheet = workbook.create_sheet("Power History")
+        sheet.column_dimensions['A'].width = 20
+        sheet.freeze_panes = "B2"
+        header_font = Font(bold=True)
+        sheet.append([self._header_cell(sheet, header, header_font) for header in ["Timestamp", *columns]])
+        
+        # Second pass: rows of one sample time are consecutive in the segment
+        with open(history_path, newline='') as segment_file:
+            reader = csv.reader(segment_file)
+            next(reader)
+            current_time, values = None, None
+            for sample_time, name, value in reader:
+                if sample_time != current_time:
+                    if current_time is not None:
+                        sheet.append([datetime.strptime(current_time, '%Y-%m-%d %H:%M:%S')] + values)
+                    current_time, values = sample_time, [None] * len(columns)
+                values[columns[name]] = float(value)
+            if current_time is not None:
+                sheet.append([datetime.strptime(current_time, '%Y-%m-%d %H:%M:%S')] + values)
+    
+    def _header_cell(self, sheet, value, font, fill=None):
+        """Styled header cell for a write-only sheet."""
+        cell = WriteOnlyCell(sheet, value=value)
+        cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        return cell
+    
+    def _append_index_entry(self, filepath, timestamp, data_first_row, data_rows,
+                            history_first_row, history_rows):
+        """Record where an interval starts in the day's side index (CSV next to the workbook)."""
+        index_path = os.path.splitext(filepath)[0] + "_index.csv"
+        new_index = not os.path.exists(index_path)
+        with open(index_path, "a") as index_file:
+            if new_index:
+                index_file.write("export_time,data_first_row,data_rows,history_first_row,history_rows\n")
+            index_file.write(f"{timestamp.strftime('%Y-%m-%d %H:%M:%S')},{data_first_row},{data_rows},"
+                             f"{history_first_row},{history_rows}\n")
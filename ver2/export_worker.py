@@ -0,0 +1,72 @@
+import queue
+import threading
+
+
+class ExportWorker:
+    """
+    Runs exports on a dedicated background thread.
+    Each job carries a snapshot of the appliances taken at the trigger instant,
+    so the export never reads live objects. Only a completion event is posted
+    back to the Tk thread.
+    """
+
+    def __init__(self, exporters, root, on_complete=None):
+        """
+        Initialize the export worker.
+
+        Args:
+            exporters: Export backends providing write_export(appliances, timestamp);
+                each job is written by every backend in turn
+            root: Tk root used to post completion events to the GUI thread
+            on_complete: Callback(success, filepath, error) run on the GUI thread
+        """
+        self.exporters = list(exporters)
+        self.root = root
+        self.on_complete = on_complete
+        self.jobs = queue.Queue()
+        self.running = False
+        self.worker_thread = None
+
+    def start(self):
+        """Start the export worker thread"""
+        self.running = True
+        self.worker_thread = threading.Thread(target=self._worker_loop, daemon=True)
+        self.worker_thread.start()
+
+    def stop(self, timeout=10):
+        """Stop the export worker thread, waiting up to timeout seconds for queued jobs to finish"""
+        self.running = False
+        self.jobs.put(None)  # Wake the worker so it can exit
+        if self.worker_thread is not None:
+            self.worker_thread.join(timeout=timeout)
+
+    def submit(self, snapshot, timestamp):
+        """Queue an export of an appliance snapshot taken at the given timestamp."""
+        self.jobs.put((snapshot, timestamp))
+
+    def _worker_loop(self):
+        """Process export jobs until stopped"""
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                if not self.running:
+                    break
+                continue
+
+            snapshot, timestamp = job
+            for exporter in self.exporters:
+                try:
+                    filepath = exporter.write_export(snapshot, timestamp)
+                    self._post_completion(True, filepath, None)
+                except Exception as e:
+                    self._post_completion(False, None, f"{exporter.format_name}: {e}")
+
+    def _post_completion(self, success, filepath, error):
+        """Schedule the completion callback on the GUI thread."""
+        if self.on_complete is None or not self.running:
+            return  # While stopping, the GUI thread may be waiting in stop()
+        try:
+            self.root.after(0, self.on_complete, success, filepath, error)
+        except Exception as e:
+            # GUI already closed - nothing left to notify
+            print(f"Export completion could not be posted: {e}")
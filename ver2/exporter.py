@@ -0,0 +1,119 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+import numpy as np
+import os
+
+
+class Exporter(ABC):
+    """
+    Base class for export backends.
+    Subclasses implement write_export(appliances, timestamp), which writes the
+    given appliances (usually a snapshot) and returns the path of the main file.
+    """
+    format_name = "Export"
+
+    def __init__(self, appliances, right_gui):
+        """Initialize the exporter."""
+        self.appliances = appliances
+        self.right_gui = right_gui
+        self.export_folder = "exports"
+
+        # Create exports directory if it doesn't exist
+        if not os.path.exists(self.export_folder):
+            os.makedirs(self.export_folder)
+
+    def export_data(self):
+        """Export the live appliance data and log the result."""
+        try:
+            # Generate filename with timestamp
+            timestamp = datetime.now()
+            filepath = self.write_export(self.appliances, timestamp)
+            filename = os.path.basename(filepath)
+
+            # Log success
+            if hasattr(self.right_gui, 'log_events'):
+                self.right_gui.log_events(f"Power data exported to {filename}")
+
+            print(f"{self.format_name} file exported: {filepath}")
+            return True
+
+        except Exception as e:
+            # Log error
+            error_msg = f"Export failed: {str(e)}"
+            if hasattr(self.right_gui, 'log_events'):
+                self.right_gui.log_events(error_msg)
+            print(error_msg)
+            return False
+
+    @abstractmethod
+    def write_export(self, appliances, timestamp):
+        """
+        Write the given appliances and return the file path.
+        Must not touch the GUI, so it is safe to call from a background thread
+        with an appliance snapshot. Raises on failure.
+        """
+
+    def _build_history_block(self, appliances, timestamp):
+        """
+        Collect every appliance history into one array (oldest sample first).
+        Returns (names, timestamps, block) where block has one column per appliance.
+        """
+        names = [name for name, a in appliances.items() if name != "All" and a is not None]
+        histories = [self._safe_get_history(appliances[name]) for name in names]
+
+        sample_count = max((len(history) for history in histories), default=0)
+        block = np.zeros((sample_count, len(names)))
+        for col, history in enumerate(histories):
+            if len(history):
+                block[sample_count - len(history):, col] = history
+
+        # Samples are one second apart, ending at the export timestamp
+        end_time = timestamp.replace(microsecond=0)
+        timestamps = [end_time - timedelta(seconds=sample_count - 1 - i) for i in range(sample_count)]
+        return names, timestamps, block
+
+    def _safe_get_power(self, appliance):
+        """Safely get current power from appliance."""
+        try:
+            if hasattr(appliance, 'get_current_power'):
+                return appliance.get_current_power()
+            return 0
+        except:
+            return 0
+
+    def _safe_get_interval_stats(self, appliance):
+        """Safely get (min, mean, max, p95) power for the current export interval."""
+        stats = getattr(appliance, 'interval_stats', None)
+        if stats is None:
+            return None, None, None, None
+        return stats.summary()
+
+    def _safe_get_history(self, appliance):
+        """Safely get power history from appliance."""
+        try:
+            if hasattr(appliance, 'get_power_history'):
+                return appliance.get_power_history()
+            return [0] * getattr(appliance, 'history_length', 300)
+        except:
+            return [0] * getattr(appliance, 'history_length', 300)
+
+
+def create_exporter(export_format, appliances, right_gui, **options):
+    """
+    Create an export backend by format name: "xlsx", "csv", "parquet" or "arrow".
+    Extra keyword options are passed to the backend's constructor.
+    Raises ImportError when the backend's optional dependency is missing.
+    """
+    if export_format == "xlsx":
+        from excel_exporter import ExcelExporter
+        return ExcelExporter(appliances, right_gui, **options)
+
+    from columnar_exporter import CsvExporter, ParquetExporter, ArrowExporter
+    backends = {
+        "csv": CsvExporter,
+        "parquet": ParquetExporter,
+        "arrow": ArrowExporter,
+    }
+    if export_format not in backends:
+        raise ValueError(f"Unknown export format: {export_format}")
+    return backends[export_format](appliances, right_gui, **options)
@@ -0,0 +1,104 @@
+import json
+import os
+from appliance import Appliance, Appliance_Summary
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+
+# Built-in fleet, used when no fleet file is present
+DEFAULT_FLEET = {
+    "history_length": 300,
+    "appliances": [
+        {"name": "Washing Machine", "id": 1, "type": "load", "power_rating": 500, "voltage_rating": 250, "variation": 5},
+        {"name": "Air Conditioner", "id": 2, "type": "load", "power_rating": 1200, "voltage_rating": 200, "variation": 5},
+        {"name": "Heater", "id": 3, "type": "load", "power_rating": 800, "voltage_rating": 150, "variation": 1},
+    ],
+}
+
+
+class FleetConfig:
+    """
+    Declarative fleet definition loaded from a JSON or TOML file.
+    Every entry names an appliance and its type, ratings, thresholds,
+    random-value variation (%) and sample interval (s). The whole registry
+    is built in one pass; history buffers are only allocated once an
+    appliance is sampled with a non-zero value or viewed.
+    """
+
+    TYPES = {"load": 0, "source": 1, "storage": 2}
+    # Entry keys that map directly onto Appliance attributes
+    PROPERTIES = {
+        "voltage_rating", "power_rating", "pwm", "fm",
+        "overvoltage_threshold", "undervoltage_threshold", "differential_threshold",
+        "max_output_power", "max_output_current",
+        "capacity", "fm_charge", "fm_discharge", "sample_interval",
+    }
+
+    def __init__(self, path="fleet.json"):
+        """
+        Initialize the fleet configuration.
+
+        Args:
+            path: Fleet file (.json or .toml); the built-in fleet is used if it does not exist
+        """
+        self.path = path
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def read(self):
+        """Return the parsed fleet definition."""
+        if not self.exists():
+            return DEFAULT_FLEET
+        if self.path.endswith(".toml"):
+            if tomllib is None:
+                raise ValueError("TOML fleet files need Python 3.11 or newer")
+            with open(self.path, 'rb') as fleet_file:
+                return tomllib.load(fleet_file)
+        with open(self.path, 'r', encoding='utf-8') as fleet_file:
+            return json.load(fleet_file)
+
+    def load(self, value_generator):
+        """
+        Build the appliance registry ("All" summary first) and register the
+        variation percentages with the value generator.
+        Raises ValueError for an invalid definition.
+        """
+        definition = self.read()
+        history_length = int(definition.get("history_length", 300))
+        entries = definition.get("appliances", [])
+
+        appliances = {"All": Appliance_Summary("All", 0, history_length)}
+        used_ids = {0}
+        next_id = max((int(entry["id"]) for entry in entries if "id" in entry), default=0) + 1
+        for index, entry in enumerate(entries):
+            name = entry.get("name")
+            if not name or name in appliances:
+                raise ValueError(f"Fleet entry {index}: missing or duplicate name {name!r}")
+
+            appliance_id = entry.get("id")
+            if appliance_id is None:
+                appliance_id, next_id = next_id, next_id + 1
+            if appliance_id in used_ids:
+                raise ValueError(f"Fleet entry {name!r}: duplicate id {appliance_id}")
+            used_ids.add(appliance_id)
+
+            appliance_type = entry.get("type", "load")
+            if appliance_type not in self.TYPES:
+                raise ValueError(f"Fleet entry {name!r}: unknown type {appliance_type!r}")
+
+            unknown = set(entry) - self.PROPERTIES - {"name", "id", "type", "variation"}
+            if unknown:
+                raise ValueError(f"Fleet entry {name!r}: unknown keys {', '.join(sorted(unknown))}")
+
+            appliance = Appliance(name, appliance_id, history_length)
+            appliance.type = self.TYPES[appliance_type]
+            for key in self.PROPERTIES.intersection(entry):
+                setattr(appliance, key, entry[key])
+            if "variation" in entry:
+                value_generator.set_appliance_variation(name, entry["variation"])
+            appliances[name] = appliance
+        return appliances
@@ -0,0 +1,200 @@
+from tkinter import *
+import numpy as np
+
+
+class Fleet_Overview_GUI:
+    """
+    Fleet overview window: a scrollable grid of small tiles, one per
+    appliance, each with a status marker, the current power and a sparkline
+    of its history.
+    The grid is virtualized: canvas items exist only for the tiles in view
+    and are reused as the view scrolls, so the cost of a frame depends on the
+    window size rather than the fleet size. All visible sparklines are scaled
+    in one numpy pass per frame.
+    """
+
+    TILE_WIDTH = 160
+    TILE_HEIGHT = 64
+    TILE_PAD = 4
+    SPARK_POINTS = 75  # Sparkline resolution; histories are decimated to this many points
+    REFRESH_INTERVAL = 1000  # ms, matches the data update rate
+    FONT = ("TkDefaultFont", 8)
+    STATUS_COLORS = {"on": "green", "off": "#bbbbbb", "fault": "red"}
+
+    def __init__(self, root, appliances, on_select=None):
+        """
+        Open the fleet overview.
+
+        Args:
+            root: Parent Tk window
+            appliances: Appliance registry (the "All" summary is skipped)
+            on_select: Called with an appliance name when its tile is clicked
+        """
+        self.appliances = appliances
+        self.on_select = on_select
+        self.fleet = []  # Appliances in display order
+        self.columns = 1
+        self.tiles = []  # Pool of reusable tile item sets
+        self.visible = []  # (tile, appliance index) for the tiles currently in view
+        self.refresh_job = None
+
+        self.window = Toplevel(root)
+        self.window.title("Fleet Overview")
+        self.window.geometry("700x500")
+        self.window.config(bg="white")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.label_status = Label(self.window, text="", bg="white", anchor='w')
+        self.label_status.pack(side=BOTTOM, fill=X, padx=5)
+        self.scrollbar = Scrollbar(self.window, orient=VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=RIGHT, fill=Y)
+        self.canvas = Canvas(self.window, bg="white", highlightthickness=0, yscrollcommand=self.scrollbar.set)
+        self.canvas.pack(side=LEFT, fill=BOTH, expand=True)
+
+        self.canvas.bind('<Configure>', lambda event: self._layout())
+        self.canvas.bind('<MouseWheel>', self._on_mouse_wheel)
+        self.canvas.bind('<Button-4>', self._on_mouse_wheel)
+        self.canvas.bind('<Button-5>', self._on_mouse_wheel)
+        self.canvas.bind('<Button-1>', self._on_click)
+
+        self.refresh()
+
+    # Layout
+    def _on_scrollbar(self, *args):
+        self.canvas.yview(*args)
+        self._layout()
+
+    def _on_mouse_wheel(self, event):
+        if event.num == 4 or getattr(event, 'delta', 0) > 0:
+            self.canvas.yview_scroll(-1, 'units')
+        else:
+            self.canvas.yview_scroll(1, 'units')
+        self._layout()
+
+    def _layout(self):
+        """Assign pooled tiles to the appliances in view and position them."""
+        width = max(self.canvas.winfo_width(), self.TILE_WIDTH)
+        height = max(self.canvas.winfo_height(), self.TILE_HEIGHT)
+        row_height = self.TILE_HEIGHT + self.TILE_PAD
+        self.columns = max(1, width // (self.TILE_WIDTH + self.TILE_PAD))
+        rows = -(-len(self.fleet) // self.columns)
+        self.canvas.config(scrollregion=(0, 0, width, max(rows * row_height, height)),
+                           yscrollincrement=row_height)
+
+        top = self.canvas.canvasy(0)
+        first_row = int(top // row_height)
+        last_row = int((top + height) // row_height)
+        first = first_row * self.columns
+        indices = range(first, min((last_row + 1) * self.columns, len(self.fleet)))
+
+        while len(self.tiles) < len(indices):
+            self.tiles.append(self._create_tile())
+        self.visible = list(zip(self.tiles, indices))
+        for tile, index in self.visible:
+            row, column = divmod(index, self.columns)
+            self._place_tile(tile, column * (self.TILE_WIDTH + self.TILE_PAD), row * row_height)
+        for tile in self.tiles[len(indices):]:
+            self.canvas.itemconfigure(tile["tag"], state='hidden')
+
+        self._update_tiles()
+
+    def _create_tile(self):
+        """Create the canvas items of one tile, all sharing a unique tag."""
+        tag = f"tile{len(self.tiles)}"
+        tile = {
+            "tag": tag,
+            "x": None,
+            "y": None,
+            "name": None,
+            "power": None,
+            "color": None,
+            "frame": self.canvas.create_rectangle(0, 0, 0, 0, outline="#cccccc", tags=tag),
+            "status": self.canvas.create_rectangle(0, 0, 0, 0, outline="", tags=tag),
+            "label": self.canvas.create_text(0, 0, anchor='nw', font=self.FONT, tags=tag),
+            "value": self.canvas.create_text(0, 0, anchor='ne', font=self.FONT, tags=tag),
+            "spark": self.canvas.create_line(0, 0, 0, 0, fill="#1f77b4", tags=tag),
+        }
+        return tile
+
+    def _place_tile(self, tile, x, y):
+        """Move a tile to (x, y); items are only moved when the slot changed."""
+        self.canvas.itemconfigure(tile["tag"], state='normal')
+        if (tile["x"], tile["y"]) == (x, y):
+            return
+        tile["x"], tile["y"] = x, y
+        self.canvas.coords(tile["frame"], x, y, x + self.TILE_WIDTH, y + self.TILE_HEIGHT)
+        self.canvas.coords(tile["status"], x + 5, y + 5, x + 13, y + 13)
+        self.canvas.coords(tile["label"], x + 17, y + 3)
+        self.canvas.coords(tile["value"], x + self.TILE_WIDTH - 4, y + 3)
+
+    # Updates
+    def refresh(self):
+        """Periodic update: pick up added appliances, then redraw the visible tiles."""
+        fleet = [appliance for name, appliance in self.appliances.items()
+                 if name != "All" and appliance is not None]
+        if len(fleet) != len(self.fleet):
+            self.fleet = fleet
+            self._layout()
+        else:
+            self.fleet = fleet
+            self._update_tiles()
+        self.label_status.config(text=f"{len(self.fleet)} appliances, "
+                                      f"{sum(appliance.power_status for appliance in self.fleet)} on")
+        self.refresh_job = self.window.after(self.REFRESH_INTERVAL, self.refresh)
+
+    def _update_tiles(self):
+        """Redraw the text and sparklines of all visible tiles in one batched pass."""
+        if not self.visible:
+            return
+        appliances = [self.fleet[index] for _, index in self.visible]
+
+        # Decimated histories of the visible appliances as one matrix
+        histories = np.zeros((len(appliances), self.SPARK_POINTS))
+        for row, appliance in enumerate(appliances):
+            if appliance.has_history():
+                history = appliance.power
+                step = max(1, len(history) // self.SPARK_POINTS)
+                samples = history[max(0, len(history) - step * self.SPARK_POINTS)::step][-self.SPARK_POINTS:]
+                histories[row, self.SPARK_POINTS - len(samples):] = samples
+
+        # Scale every sparkline to its own range (including zero) at once
+        low = np.minimum(histories.min(axis=1, keepdims=True), 0)
+        high = np.maximum(histories.max(axis=1, keepdims=True), low + 1)
+        spark_top, spark_bottom = 20, self.TILE_HEIGHT - 5
+        y_offsets = spark_bottom - (spark_bottom - spark_top) * (histories - low) / (high - low)
+        x_offsets = np.linspace(5, self.TILE_WIDTH - 5, self.SPARK_POINTS)
+
+        coords = np.empty((len(appliances), 2 * self.SPARK_POINTS))
+        for row, ((tile, _), appliance) in enumerate(zip(self.visible, appliances)):
+            coords[row, 0::2] = x_offsets + tile["x"]
+            coords[row, 1::2] = y_offsets[row] + tile["y"]
+            self.canvas.coords(tile["spark"], coords[row].tolist())
+            self._update_tile_text(tile, appliance)
+
+    def _update_tile_text(self, tile, appliance):
+        """Update name, power and status; Tk is only called for values that changed."""
+        name = appliance.name if len(appliance.name) <= 18 else appliance.name[:17] + "…"
+        if name != tile["name"]:
+            tile["name"] = name
+            self.canvas.itemconfigure(tile["label"], text=name)
+        power = f"{appliance.get_current_power():.0f} W"
+        if power != tile["power"]:
+            tile["power"] = power
+            self.canvas.itemconfigure(tile["value"], text=power)
+        state = "fault" if appliance.fault else "on" if appliance.power_status else "off"
+        if state != tile["color"]:
+            tile["color"] = state
+            self.canvas.itemconfigure(tile["status"], fill=self.STATUS_COLORS[state])
+
+    def _on_click(self, event):
+        """Select the clicked appliance in the main window."""
+        x, y = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+        column = int(x // (self.TILE_WIDTH + self.TILE_PAD))
+        index = int(y // (self.TILE_HEIGHT + self.TILE_PAD)) * self.columns + column
+        if column < self.columns and 0 <= index < len(self.fleet) and self.on_select:
+            self.on_select(self.fleet[index].name)
+
+    def close(self):
+        if self.refresh_job is not None:
+            self.window.after_cancel(self.refresh_job)
+        self.window.destroy()
@@ -0,0 +1,267 @@
+import os
+import queue
+import struct
+import threading
+import zlib
+from datetime import datetime
+import numpy as np
+from appliance import Appliance, Appliance_Summary
+
+
+# Per-appliance configuration and counters, one fixed-size record each.
+# Power and fault state are not kept: the panel always starts with every appliance OFF.
+RECORD_FIELDS = [
+    ('ID', '<i4'), ('type', '<i1'),
+    ('voltage_rating', '<f8'), ('power_rating', '<f8'), ('pwm', '<f8'), ('fm', '<f8'),
+    ('overvoltage_threshold', '<f8'), ('undervoltage_threshold', '<f8'), ('differential_threshold', '<f8'),
+    ('max_output_power', '<f8'), ('max_output_current', '<f8'),
+    ('capacity', '<f8'), ('fm_charge', '<f8'), ('fm_discharge', '<f8'),
+    ('time_operated', '<i8'), ('energy_used', '<f8'), ('power_on_time', '<f8'),
+    ('variation', '<f8'),  # Random value generator variation (%), NaN when unset
+    ('has_history', 'u1'),  # Whether the appliance has a power buffer in the buffer block
+    ('added_from_gui', 'u1'),  # Added from the GUI rather than the fleet configuration
+]
+RECORD_DTYPE = np.dtype(RECORD_FIELDS)
+# Version 1 records had no has_history field: every appliance had a buffer.
+# Versions 1 and 2 had no added_from_gui field: snapshot-only appliances were all GUI-added.
+RECORD_DTYPES = {1: np.dtype(RECORD_FIELDS[:-2]), 2: np.dtype(RECORD_FIELDS[:-1]), 3: RECORD_DTYPE}
+ATTRIBUTE_FIELDS = [field for field, _ in RECORD_FIELDS[1:-3]]
+COUNTER_FIELDS = ('time_operated', 'energy_used', 'power_on_time')
+SETTING_FIELDS = [field for field in ATTRIBUTE_FIELDS if field not in COUNTER_FIELDS]
+
+# magic, version, saved_at (ms), appliance count, buffer length, names blob length
+HEADER = struct.Struct('<4sHqIII')
+MAGIC = b'DCNS'
+VERSION = 3
+
+
+class FleetSnapshot:
+    """
+    Versioned binary snapshot of the whole fleet: names, configuration,
+    thresholds, counters and power ring buffers.
+    Layout: header, one fixed-size numpy record per appliance, the
+    NUL-separated UTF-8 names, the allocated ring buffers as one float64
+    block, then a CRC32 of everything before it. Loading is a handful of frombuffer calls,
+    so thousands of appliances restore in milliseconds.
+    Snapshots are packed and written atomically on a background thread.
+    """
+
+    def __init__(self, path=os.path.join("data", "fleet.snapshot"), interval=30):
+        """
+        Initialize the fleet snapshot.
+
+        Args:
+            path: Snapshot file
+            interval: Seconds between background snapshots
+        """
+        self.path = path
+        self.interval = interval
+        self.pending = queue.Queue(maxsize=1)
+        self.writer_thread = None
+        self.last_save_time = None
+
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+    def start(self):
+        """Start the writer thread"""
+        self.writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self.writer_thread.start()
+
+    def stop(self):
+        """Stop the writer thread after writing any queued snapshot"""
+        self.pending.put(None)
+        if self.writer_thread is not None:
+            self.writer_thread.join(timeout=5)
+
+    def is_due(self, now):
+        """True when the background interval has elapsed."""
+        return self.last_save_time is None or (now - self.last_save_time).total_seconds() >= self.interval
+
+    def submit(self, appliances, variations, timestamp):
+        """
+        Queue detached appliance snapshots for the writer thread.
+        A snapshot still waiting to be written is replaced by the newer one.
+        """
+        self.last_save_time = timestamp
+        try:
+            self.pending.get_nowait()
+        except queue.Empty:
+            pass
+        self.pending.put((appliances, variations, timestamp))
+
+    def _writer_loop(self):
+        """Write queued snapshots until stopped"""
+        while True:
+            item = self.pending.get()
+            if item is None:
+                break
+            try:
+                self.save(*item)
+            except OSError as e:
+                print(f"Error writing fleet snapshot: {e}")
+
+    # Writing
+    def save(self, appliances, variations, timestamp=None):
+        """Pack the fleet and write it atomically."""
+        timestamp = timestamp or datetime.now()
+        data = self.pack(appliances, variations, timestamp)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'wb') as snapshot_file:
+            snapshot_file.write(data)
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temp_path, self.path)
+
+    @staticmethod
+    def pack(appliances, variations, timestamp):
+        """Serialize the fleet to bytes."""
+        fleet = [(name, appliance) for name, appliance in appliances.items() if appliance is not None]
+        buffer_length = max((appliance.history_length for _, appliance in fleet), default=0)
+
+        records = np.zeros(len(fleet), dtype=RECORD_DTYPE)
+        for field, _ in RECORD_FIELDS[:-3]:
+            records[field] = [getattr(appliance, field, 0) or 0 for _, appliance in fleet]
+        records['variation'] = [variations.get(name, np.nan) for name, _ in fleet]
+        records['has_history'] = [appliance.has_history() for _, appliance in fleet]
+        records['added_from_gui'] = [getattr(appliance, 'added_from_gui', False) for _, appliance in fleet]
+
+        # Only allocated buffers are stored
+        with_history = [appliance for _, appliance in fleet if appliance.has_history()]
+        buffers = np.zeros((len(with_history), buffer_length), dtype='<f8')
+        for row, appliance in enumerate(with_history):
+            power = appliance.power
+            buffers[row, buffer_length - len(power):] = power
+
+        names = "\0".join(name for name, _ in fleet).encode('utf-8')
+        header = HEADER.pack(MAGIC, VERSION, int(timestamp.timestamp() * 1000), len(fleet), buffer_length, len(names))
+        body = header + records.tobytes() + names + buffers.tobytes()
+        return body + struct.pack('<I', zlib.crc32(body))
+
+    # Loading
+    def load(self, now=None):
+        """
+        Rebuild the fleet from the snapshot.
+        Ring buffers are shifted by the time since the snapshot was taken, so
+        samples keep their age. Returns (appliances, variations), or None when
+        there is no usable snapshot.
+        """
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'rb') as snapshot_file:
+            data = snapshot_file.read()
+        try:
+            return self.unpack(data, now or datetime.now())
+        except (ValueError, struct.error) as e:
+            print(f"Ignoring fleet snapshot {self.path}: {e}")
+            return None
+
+    def restore(self, appliances, value_generator, restore_settings=True, now=None):
+        """
+        Merge the snapshot into a fleet built from the fleet configuration.
+        Appliances added from the GUI are added back; ones removed from the
+        fleet configuration stay removed. For the others, counters and power history are restored, and settings
+        too when restore_settings is set. Returns the snapshot path, or None.
+        """
+        restored = self.load(now)
+        if restored is None:
+            return None
+        saved_appliances, variations = restored
+        used_ids = {appliance.ID for appliance in appliances.values() if appliance is not None}
+        history_length = appliances["All"].history_length
+
+        for name, saved in saved_appliances.items():
+            appliance = appliances.get(name)
+            if appliance is None:
+                if not saved.added_from_gui:
+                    continue  # Removed from the fleet configuration
+                if saved.ID in used_ids:
+                    # Its samples are logged under this ID, so it is not renumbered
+                    print(f"Not restoring appliance {name}: ID {saved.ID} is now used by the fleet configuration")
+                    continue
+                used_ids.add(saved.ID)
+                # Fit the buffer to the configured history length
+                history = saved.power[-history_length:] if saved.has_history() else None
+                saved.history_length = history_length
+                if history is not None:
+                    saved.power = [0] * (history_length - len(history)) + history
+                appliances[name] = saved
+                if name in variations:
+                    value_generator.set_appliance_variation(name, variations[name])
+                continue
+
+            if saved.has_history():
+                history = saved.power[-appliance.history_length:]
+                appliance.power = [0] * (appliance.history_length - len(history)) + history
+            if saved.type == -1:
+                continue
+            for field in COUNTER_FIELDS:
+                setattr(appliance, field, getattr(saved, field))
+            if restore_settings:
+                for field in SETTING_FIELDS:
+                    setattr(appliance, field, getattr(saved, field))
+                if name in variations:
+                    value_generator.set_appliance_variation(name, variations[name])
+        return self.path
+
+    @staticmethod
+    def unpack(data, now):
+        """Deserialize bytes written by pack()."""
+        if len(data) < HEADER.size + 4 or struct.unpack_from('<I', data, len(data) - 4)[0] != zlib.crc32(data[:-4]):
+            raise ValueError("checksum mismatch")
+        magic, version, saved_at, count, buffer_length, names_length = HEADER.unpack_from(data)
+        if magic != MAGIC or version not in RECORD_DTYPES:
+            raise ValueError(f"unsupported snapshot version {version}")
+
+        offset = HEADER.size
+        records = np.frombuffer(data, dtype=RECORD_DTYPES[version], count=count, offset=offset)
+        offset += records.nbytes
+        names = data[offset:offset + names_length].decode('utf-8').split("\0") if count else []
+        offset += names_length
+        if 'has_history' in records.dtype.names:
+            with_history = np.flatnonzero(records['has_history'])
+        else:
+            with_history = np.arange(count)
+        buffers = np.frombuffer(data, dtype='<f8', count=len(with_history) * buffer_length,
+                                offset=offset).reshape(len(with_history), buffer_length)
+
+        # Age the ring buffers by the time the panel was down
+        elapsed = int((now.timestamp() * 1000 - saved_at) // 1000)
+        if elapsed > 0:
+            aged = np.zeros_like(buffers)
+            if elapsed < buffer_length:
+                aged[:, :buffer_length - elapsed] = buffers[:, elapsed:]
+            buffers = aged
+
+        # Convert column-wise; whole-number values become ints so ratings display as before
+        columns = {}
+        for field in records.dtype.names:
+            column = records[field]
+            if column.dtype.kind == 'f':
+                values = column.astype(object)
+                whole = np.isfinite(column) & (column == np.floor(column))
+                values[whole] = column[whole].astype(np.int64).tolist()
+                columns[field] = values.tolist()
+            else:
+                columns[field] = column.tolist()
+        attribute_rows = zip(*(columns[field] for field in ATTRIBUTE_FIELDS))
+        added_from_gui = columns.get('added_from_gui', [True] * count)
+        power_rows = dict(zip(with_history.tolist(), buffers.tolist()))
+
+        appliances = {}
+        variations = {}
+        for row, (name, attributes) in enumerate(zip(names, attribute_rows)):
+            if columns['type'][row] == -1:
+                appliance = Appliance_Summary(name, columns['ID'][row], buffer_length)
+            else:
+                appliance = Appliance(name, columns['ID'][row], buffer_length)
+                appliance.__dict__.update(zip(ATTRIBUTE_FIELDS, attributes))
+                appliance.added_from_gui = bool(added_from_gui[row])
+                variation = columns['variation'][row]
+                if variation == variation:  # NaN when unset
+                    variations[name] = variation
+            if row in power_rows:
+                appliance.power = power_rows[row]
+            appliances[name] = appliance
+        return appliances, variations
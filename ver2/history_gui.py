@@ -0,0 +1,182 @@
+from tkinter import *
+from datetime import datetime, timedelta
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import matplotlib.dates as mdates
+from appliance import Appliance_Summary
+
+
+class History_GUI:
+    """
+    Zoomable long-range history browser shown in its own window.
+    Offers range presets from 5 minutes to 30 days, pan and zoom buttons and
+    mouse-wheel zoom around the cursor. Every view is fetched from the stored
+    history as a min/max-decimated series of at most twice the plot's pixel
+    width, so even a month of data stays a few hundred points.
+    """
+
+    PRESETS = [
+        ("5 min", timedelta(minutes=5)),
+        ("1 h", timedelta(hours=1)),
+        ("6 h", timedelta(hours=6)),
+        ("1 day", timedelta(days=1)),
+        ("7 days", timedelta(days=7)),
+        ("30 days", timedelta(days=30)),
+    ]
+    MIN_SPAN = timedelta(minutes=1)
+    MAX_SPAN = timedelta(days=30)
+    FOLLOW_INTERVAL = 5000  # ms between reloads while the view tracks the current time
+
+    def __init__(self, root, history_query, appliance):
+        """
+        Open the history browser.
+
+        Args:
+            root: Parent Tk window
+            history_query: HistoryQuery over the stored samples
+            appliance: Appliance (or the "All" summary, shown as net power) to browse
+        """
+        self.history_query = history_query
+        self.appliance = appliance
+        self.span = self.PRESETS[0][1]
+        self.end = datetime.now()
+        self.following = True  # The view tracks the current time until panned back
+        self.follow_job = None
+        self.local_tz = datetime.now().astimezone().tzinfo
+
+        self.window = Toplevel(root)
+        self.window.title(f"Power History - {appliance.name}")
+        self.window.geometry("800x480")
+        self.window.config(bg="white")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self._create_controls()
+        self._create_graph()
+        self.load()
+
+    def _create_controls(self):
+        """Create the range preset, pan and zoom buttons."""
+        frame_controls = Frame(self.window, bg="white")
+        frame_controls.pack(side=TOP, fill=X, padx=5, pady=3)
+
+        for label, span in self.PRESETS:
+            Button(frame_controls, text=label, width=6,
+                   command=lambda span=span: self.set_range(span)).pack(side=LEFT, padx=2)
+
+        Button(frame_controls, text="Now", width=5, command=self.jump_to_now).pack(side=RIGHT, padx=2)
+        Button(frame_controls, text="▶", width=3, command=lambda: self.pan(0.5)).pack(side=RIGHT, padx=2)
+        Button(frame_controls, text="◀", width=3, command=lambda: self.pan(-0.5)).pack(side=RIGHT, padx=2)
+        Button(frame_controls, text="−", width=3, command=lambda: self.zoom(2)).pack(side=RIGHT, padx=2)
+        Button(frame_controls, text="+", width=3, command=lambda: self.zoom(0.5)).pack(side=RIGHT, padx=2)
+
+        self.label_status = Label(self.window, text="", bg="white", anchor='w')
+        self.label_status.pack(side=BOTTOM, fill=X, padx=5)
+
+    def _create_graph(self):
+        """Create the matplotlib graph with a date axis that adapts to the span."""
+        self.fig = plt.Figure(figsize=(10, 5), dpi=80)
+        self.ax = self.fig.add_subplot(111)
+        self.ax.set_ylabel('Net Power (W)' if isinstance(self.appliance, Appliance_Summary) else 'Power (W)')
+        self.ax.grid(True)
+
+        # Stored timestamps are UTC; label them in local time
+        locator = mdates.AutoDateLocator(tz=self.local_tz)
+        self.ax.xaxis.set_major_locator(locator)
+        self.ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator, tz=self.local_tz))
+
+        # The min/max series is drawn as one line alternating between bucket extremes
+        self.line, = self.ax.plot([], [], linewidth=1)
+
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.window)
+        self.canvas.get_tk_widget().pack(side=TOP, fill=BOTH, expand=True)
+        self.canvas.mpl_connect('scroll_event', self._on_scroll)
+
+    # Navigation
+    def set_range(self, span):
+        """Show the last span of time and follow the current time."""
+        self.span = span
+        self.jump_to_now()
+
+    def jump_to_now(self):
+        self.end = datetime.now()
+        self.following = True
+        self.load()
+
+    def pan(self, fraction):
+        """Move the view by a fraction of its span (negative is back in time)."""
+        self.end = self.end + self.span * fraction
+        self._clamp_to_now()
+        self.load()
+
+    def zoom(self, factor, anchor=None):
+        """Scale the span by factor, keeping the anchor time (default: the centre) in place."""
+        start = self.end - self.span
+        anchor = anchor or start + self.span / 2
+        span = min(max(self.span * factor, self.MIN_SPAN), self.MAX_SPAN)
+        ratio = (anchor - start) / self.span
+        self.end = anchor + span * (1 - ratio)
+        self.span = span
+        self._clamp_to_now()
+        self.load()
+
+    def _clamp_to_now(self):
+        """Never show the future; reaching the present resumes following."""
+        now = datetime.now()
+        self.following = self.end >= now
+        if self.following:
+            self.end = now
+
+    def _on_scroll(self, event):
+        """Mouse-wheel zoom around the time under the cursor."""
+        if event.xdata is None:
+            return
+        anchor = mdates.num2date(event.xdata, tz=self.local_tz).replace(tzinfo=None)
+        self.zoom(0.5 if event.button == 'up' else 2, anchor)
+
+    # Data
+    def load(self):
+        """Fetch the visible range at plot resolution and redraw."""
+        if self.following:
+            self.end = datetime.now()
+        start = self.end - self.span
+
+        # At most two points (bucket min and max) per horizontal pixel
+        max_points = max(2 * int(self.ax.bbox.width), 100)
+        appliance_id = self.appliance.ID
+        times, values = self.history_query.query(appliance_id, start, self.end, max_points, "minmax")[appliance_id]
+
+        self.line.set_data(mdates.date2num(times), values)
+        self.ax.set_xlim(mdates.date2num(start.astimezone(self.local_tz)),
+                         mdates.date2num(self.end.astimezone(self.local_tz)))
+        self._set_y_limits(values)
+
+        if len(values):
+            self.label_status.config(text=f"{len(values)} points, {values.min():.1f} W to {values.max():.1f} W")
+        else:
+            self.label_status.config(text="No stored samples in this range")
+        self.canvas.draw_idle()
+        self._schedule_follow()
+
+    def _set_y_limits(self, values):
+        """Fit the y-axis to the data with 10% padding, starting from zero unless negative."""
+        if not len(values):
+            self.ax.set_ylim(0, 10)
+            return
+        max_value = float(values.max())
+        min_value = float(values.min())
+        y_min = min_value - abs(min_value) * 0.1 if min_value < 0 else 0
+        y_max = max_value + abs(max_value) * 0.1 if max_value > 0 else 10
+        self.ax.set_ylim(y_min, y_max)
+
+    def _schedule_follow(self):
+        """Reload periodically while the view tracks the current time."""
+        if self.follow_job is not None:
+            self.window.after_cancel(self.follow_job)
+            self.follow_job = None
+        if self.following:
+            self.follow_job = self.window.after(self.FOLLOW_INTERVAL, self.load)
+
+    def close(self):
+        if self.follow_job is not None:
+            self.window.after_cancel(self.follow_job)
+        self.window.destroy()
@@ -0,0 +1,341 @@
+import csv
+import gzip
+import os
+import re
+from datetime import datetime, timedelta
+import numpy as np
+from excel_exporter import read_last_index_entry, read_segment_tail
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Arrow/Parquet exports can only be read with pyarrow
+    pa = None
+    pq = None
+
+
+class HistoryLoader:
+    """
+    Restores appliance counters and recent power history from the newest export
+    at startup, so the panel resumes where it stopped.
+    Reads only what it needs: columnar snapshots are memory-mapped or read by
+    column, daily workbooks (or, for the current day, their CSV segments) are read
+    from the rows listed in their side index, and
+    interval workbooks are streamed in read-only mode up to the sections used.
+    History samples are placed by timestamp, so time spent switched off shows as zeros.
+    """
+
+    SNAPSHOT_PATTERN = re.compile(r"^appliance_data_(\d{8}_\d{4})_snapshot\.(arrow|parquet|csv\.gz)$")
+    INTERVAL_PATTERN = re.compile(r"^appliance_data_(\d{8}_\d{4})\.xlsx$")
+    DAILY_INDEX_PATTERN = re.compile(r"^appliance_data_(\d{8})_index\.csv$")
+
+    # Preferred source when several exports share a timestamp (fastest to read first)
+    FORMAT_PRIORITY = {"arrow": 4, "parquet": 3, "csv.gz": 2, "daily": 1, "xlsx": 0}
+
+    def __init__(self, export_folder="exports", history_length=300):
+        """Initialize the loader for the given exports folder and power buffer length (seconds)."""
+        self.export_folder = export_folder
+        self.history_length = history_length
+
+    def restore(self, appliances, now=None):
+        """
+        Restore energy, operating time and recent history into the appliances.
+        Returns the path of the export used, or None if nothing could be restored.
+        """
+        now = now or datetime.now()
+        for export_time, export_format, path in self._find_exports():
+            try:
+                state, history = self._load(export_format, path)
+            except Exception as e:
+                print(f"Could not restore from {path}: {e}")
+                continue
+            self._apply_counters(appliances, state)
+            self._apply_history(appliances, history, now)
+            return path
+        return None
+
+    # Locating exports
+    def _find_exports(self):
+        """Return candidate exports, newest (and fastest to read) first."""
+        if not os.path.isdir(self.export_folder):
+            return []
+
+        candidates = []
+        for filename in os.listdir(self.export_folder):
+            path = os.path.join(self.export_folder, filename)
+            match = self.SNAPSHOT_PATTERN.match(filename)
+            if match:
+                if match.group(2) in ("arrow", "parquet") and pa is None:
+                    continue
+                export_time = datetime.strptime(match.group(1), '%Y%m%d_%H%M')
+                candidates.append((export_time, match.group(2), path))
+                continue
+
+            match = self.INTERVAL_PATTERN.match(filename)
+            if match:
+                export_time = datetime.strptime(match.group(1), '%Y%m%d_%H%M')
+                candidates.append((export_time, "xlsx", path))
+                continue
+
+            match = self.DAILY_INDEX_PATTERN.match(filename)
+            if match:
+                last_entry = read_last_index_entry(path)
+                if last_entry is not None:
+                    export_time = datetime.strptime(last_entry['export_time'], '%Y-%m-%d %H:%M:%S')
+                    # Compare at minute precision, like the other filenames
+                    candidates.append((export_time.replace(second=0), "daily", path))
+
+        candidates.sort(key=lambda entry: (entry[0], self.FORMAT_PRIORITY[entry[1]]), reverse=True)
+        return candidates
+
+    def _load(self, export_format, path):
+        """Load (state, history) from one export."""
+        if export_format == "arrow":
+            return self._load_arrow(path)
+        if export_format == "parquet":
+            return self._load_parquet(path)
+        if export_format == "csv.gz":
+            return self._load_csv(path)
+        if export_format == "daily":
+            return self._load_daily_workbook(path)
+        return self._load_interval_workbook(path)
+
+    # Columnar exports
+    def _load_arrow(self, snapshot_path):
+        """Memory-map an Arrow snapshot and its history table."""
+        def read(path):
+            with pa.memory_map(path) as source:
+                return pa.ipc.open_file(source).read_all()
+
+        state = self._state_from_table(read(snapshot_path))
+        history_path = snapshot_path.replace("_snapshot.arrow", "_history.arrow")
+        history = self._history_from_table(read(history_path)) if os.path.exists(history_path) else None
+        return state, history
+
+    def _load_parquet(self, snapshot_path):
+        """Read only the needed columns of a Parquet snapshot and its history table."""
+        state = self._state_from_table(
+            pq.read_table(snapshot_path, columns=['appliance', 'energy_used_wh', 'time_operated_s']))
+        history_path = snapshot_path.replace("_snapshot.parquet", "_history.parquet")
+        history = None
+        if os.path.exists(history_path):
+            history = self._history_from_table(pq.read_table(history_path))
+        return state, history
+
+    def _state_from_table(self, table):
+        """Build {name: (energy_used, time_operated)} from a snapshot table."""
+        columns = table.select(['appliance', 'energy_used_wh', 'time_operated_s']).to_pydict()
+        return {name: (energy, operated) for name, energy, operated in
+                zip(columns['appliance'], columns['energy_used_wh'], columns['time_operated_s'])}
+
+    def _history_from_table(self, table):
+        """Convert a long-form history table to (names, codes, times, values) arrays."""
+        appliance_column = table.column('appliance').combine_chunks()
+        if not pa.types.is_dictionary(appliance_column.type):
+            appliance_column = appliance_column.dictionary_encode()
+        names = appliance_column.dictionary.to_pylist()
+        codes = appliance_column.indices.to_numpy(zero_copy_only=False)
+        times = table.column('timestamp').to_numpy().astype('datetime64[s]')
+        values = table.column('power_w').to_numpy()
+        return names, codes, times, values
+
+    def _load_csv(self, snapshot_path):
+        """Read a gzip CSV snapshot and its history table."""
+        state = {}
+        with gzip.open(snapshot_path, 'rt', newline='') as csv_file:
+            for row in csv.DictReader(csv_file):
+                state[row['appliance']] = (float(row['energy_used_wh']), int(row['time_operated_s']))
+
+        history = None
+        history_path = snapshot_path.replace("_snapshot.csv.gz", "_history.csv.gz")
+        if os.path.exists(history_path):
+            with gzip.open(history_path, 'rt', newline='') as csv_file:
+                reader = csv.reader(csv_file)
+                next(reader)  # Header
+                names, codes, times, values = self._columns_from_csv_rows(reader)
+            history = (names, np.array(codes, dtype=np.int64),
+                       np.array(times, dtype=np.int64).astype('datetime64[s]'),
+                       np.fromiter(map(float, values), dtype=float, count=len(values)))
+        return state, history
+
+    def _columns_from_csv_rows(self, reader):
+        """
+        Split long-form CSV rows into columns, parsing each distinct timestamp once.
+        Times are returned as integer seconds since the epoch.
+        """
+        names, name_codes, parsed_times = [], {}, {}
+        codes, times, values = [], [], []
+        for timestamp, name, value in reader:
+            code = name_codes.get(name)
+            if code is None:
+                code = name_codes[name] = len(names)
+                names.append(name)
+            sample_time = parsed_times.get(timestamp)
+            if sample_time is None:
+                sample_time = parsed_times[timestamp] = int(np.datetime64(timestamp.replace(' ', 'T'), 's').astype(np.int64))
+            codes.append(code)
+            times.append(sample_time)
+            values.append(value)
+        return names, codes, times, values
+
+    # Excel exports
+    def _load_daily_workbook(self, index_path):
+        """Read only the last interval's rows and the last history_length history rows of a daily workbook."""
+        entry = read_last_index_entry(index_path)
+        workbook_path = index_path.replace("_index.csv", ".xlsx")
+        if not os.path.exists(workbook_path):
+            return self._load_daily_segments(index_path.replace("_index.csv", ""), entry)
+
+        import openpyxl
+        workbook = openpyxl.load_workbook(workbook_path, read_only=True)
+        try:
+            data_sheet = workbook["Power Data"]
+            header = next(data_sheet.iter_rows(min_row=1, max_row=1, values_only=True))
+            columns = {name: col for col, name in enumerate(header)}
+            first_row = int(entry['data_first_row'])
+            last_row = first_row + int(entry['data_rows']) - 1
+
+            state = {}
+            for row in data_sheet.iter_rows(min_row=first_row, max_row=last_row, values_only=True):
+                name = row[columns["Appliance"]]
+                operated_col = columns.get("Time Operated (s)")
+                operated = row[operated_col] if operated_col is not None else 0
+                state[name] = (float(row[columns["Energy Used (Wh)"]] or 0), int(operated or 0))
+
+            history = None
+            history_rows = int(entry.get('history_rows') or 0)
+            if history_rows and "Power History" in workbook.sheetnames:
+                history_sheet = workbook["Power History"]
+                names = next(history_sheet.iter_rows(min_row=1, max_row=1, values_only=True))[1:]
+                last_row = int(entry['history_first_row']) + history_rows - 1
+                first_row = max(2, last_row - self.history_length + 1)
+                history = self._history_from_rows(
+                    (row[0], name, value)
+                    for row in history_sheet.iter_rows(min_row=first_row, max_row=last_row, values_only=True)
+                    for name, value in zip(names, row[1:]) if value is not None)
+        finally:
+            workbook.close()
+        return state, history
+
+    def _load_daily_segments(self, base_path, entry):
+        """Read the last interval and the last history_length seconds of history from the CSV segments of the current day."""
+        export_time = datetime.strptime(entry['export_time'], '%Y-%m-%d %H:%M:%S')
+        since = (export_time - timedelta(seconds=1)).strftime('%Y-%m-%d %H:%M:%S')
+        state = {}
+        for row in read_segment_tail(base_path + "_data.segment.csv", since):
+            if row[0] == entry['export_time']:
+                state[row[1]] = (float(row[4] or 0), int(float(row[5] or 0)))
+
+        history = None
+        if int(entry.get('history_rows') or 0):
+            since = (export_time - timedelta(seconds=self.history_length)).strftime('%Y-%m-%d %H:%M:%S')
+            rows = read_segment_tail(base_path + "_history.segment.csv", since)
+            history = self._history_from_rows(
+                (datetime.strptime(sample_time, '%Y-%m-%d %H:%M:%S'), name, float(value))
+                for sample_time, name, value in rows)
+        return state, history
+
+    def _load_interval_workbook(self, workbook_path):
+        """
+        Stream an interval report in read-only mode.
+        Reads the appliance table and the recent history section, plus the
+        "Power History" sheet when the export was written in full history mode.
+        """
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(workbook_path, read_only=True)
+        try:
+            state = {}
+            recent = []
+            export_time = None
+            section = None
+            header = None
+            for row in workbook["Power Data"].iter_rows(values_only=True):
+                first = row[0] if row else None
+                if isinstance(first, str) and first.startswith("Export Time: "):
+                    export_time = datetime.strptime(first[len("Export Time: "):], '%Y-%m-%d %H:%M:%S')
+                elif first == "Individual Appliances":
+                    section, header = "appliances", None
+                elif isinstance(first, str) and first.startswith("Recent Power History"):
+                    section, header = "recent", None
+                elif first is None:
+                    continue
+                elif header is None and section is not None:
+                    header = row
+                elif section == "appliances":
+                    columns = {name: col for col, name in enumerate(header)}
+                    operated_col = columns.get("Time Operated (s)")
+                    operated = row[operated_col] if operated_col is not None else 0
+                    # Energy is written as text with the Wh value
+                    state[first] = (float(row[columns["Energy Used (kWh)"]] or 0), int(operated or 0))
+                elif section == "recent" and export_time is not None:
+                    sample_time = export_time - timedelta(seconds=int(str(first)[2:]))  # "T-9" .. "T-0"
+                    recent.extend((sample_time, name, float(value))
+                                  for name, value in zip(header[1:], row[1:]) if value is not None)
+
+            history = None
+            if "Power History" in workbook.sheetnames:
+                rows = workbook["Power History"].iter_rows(values_only=True)
+                names = next(rows)[1:]
+                history = self._history_from_rows(
+                    (row[0], name, value) for row in rows
+                    for name, value in zip(names, row[1:]) if value is not None)
+            elif recent:
+                history = self._history_from_rows(recent)
+        finally:
+            workbook.close()
+        return state, history
+
+    def _history_from_rows(self, rows):
+        """Convert (timestamp, name, value) rows to (names, codes, times, values) arrays."""
+        names = []
+        name_codes = {}
+        codes, times, values = [], [], []
+        for timestamp, name, value in rows:
+            if name not in name_codes:
+                name_codes[name] = len(names)
+                names.append(name)
+            codes.append(name_codes[name])
+            times.append(timestamp)
+            values.append(value)
+        return (names, np.array(codes, dtype=np.int64),
+                np.array(times, dtype='datetime64[s]'), np.array(values, dtype=float))
+
+    # Applying restored data
+    def _apply_counters(self, appliances, state):
+        """Restore energy and operating time counters by appliance name."""
+        for name, (energy_used, time_operated) in state.items():
+            appliance = appliances.get(name)
+            if name == "All" or appliance is None:
+                continue
+            appliance.energy_used = energy_used
+            appliance.time_operated = time_operated
+            appliance.power_on_time = time_operated
+
+    def _apply_history(self, appliances, history, now):
+        """Place restored samples into each power buffer by their age relative to now."""
+        if history is None:
+            return
+        names, codes, times, values = history
+        if not len(codes):
+            return
+
+        # Age in seconds of every sample; group samples per appliance with one sort
+        ages = (np.datetime64(now.replace(microsecond=0), 's') - times).astype(np.int64)
+        order = np.argsort(codes, kind='stable')
+        boundaries = np.searchsorted(codes[order], np.arange(len(names) + 1))
+
+        for code, name in enumerate(names):
+            appliance = appliances.get(name)
+            if name == "All" or appliance is None:
+                continue
+            rows = order[boundaries[code]:boundaries[code + 1]]
+            # Appliances that only read zero keep their buffer unallocated
+            if not appliance.has_history() and not values[rows].any():
+                continue
+            buffer = np.array(appliance.power, dtype=float)
+            slots = len(buffer) - 1 - ages[rows]
+            valid = (slots >= 0) & (slots < len(buffer))
+            if valid.any():
+                buffer[slots[valid]] = values[rows][valid]
+                appliance.power = buffer.tolist()
@@ -0,0 +1,211 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+import numpy as np
+
+
+class HistoryQuery:
+    """
+    Time-range queries over the persisted sample history, downsampled on the
+    query side so callers never receive more than max_points per appliance.
+    Each query reads from the coarsest tier that still resolves the range
+    (raw samples, 1-minute or 1-hour rollups) and then reduces it with
+    min/max bucketing, bucket means or LTTB. Tier data is fetched in fixed
+    time blocks which are kept in an LRU cache, so panning and zooming over
+    overlapping ranges only reads the blocks that are new.
+    """
+
+    # (bucket seconds, table) from finest to coarsest; raw samples have no rollup columns
+    TIERS = [(1, "samples"), (60, "rollup_1m"), (3600, "rollup_1h")]
+    BLOCK_POINTS = 1024  # Tier points per cached block
+    AGGREGATIONS = ("minmax", "mean", "min", "max", "lttb")
+
+    def __init__(self, db_path, cache_blocks=256, oversample=4):
+        """
+        Initialize the query engine.
+
+        Args:
+            db_path: SQLite database written by SampleStore
+            cache_blocks: Maximum number of tier blocks kept in the cache
+            oversample: A tier is used while it has at most oversample * max_points points in range
+        """
+        self.db_path = db_path
+        self.cache_blocks = cache_blocks
+        self.oversample = oversample
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.connection = None
+
+    def query(self, appliance_ids, start, end, max_points=600, agg="minmax"):
+        """
+        Return {appliance_id: (times, values)} for a time range.
+
+        Args:
+            appliance_ids: Appliance ID or iterable of IDs
+            start, end: datetimes bounding the range (inclusive)
+            max_points: Upper bound on points returned per appliance
+            agg: "minmax" (a min and a max per bucket, keeps spikes), "mean",
+                 "min", "max" or "lttb" (largest-triangle-three-buckets)
+
+        times is a datetime64[ms] array (UTC) and values a float array.
+        """
+        if agg not in self.AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation: {agg}")
+        if isinstance(appliance_ids, int):
+            appliance_ids = [appliance_ids]
+
+        start_ms = int(start.timestamp() * 1000)
+        end_ms = int(end.timestamp() * 1000)
+        tier_seconds, table = self._choose_tier(end_ms - start_ms, max_points)
+
+        results = {}
+        with self.lock:
+            for appliance_id in appliance_ids:
+                ts, mean, minimum, maximum = self._read_range(appliance_id, tier_seconds, table, start_ms, end_ms)
+                ts, values = self._downsample(ts, mean, minimum, maximum, start_ms, end_ms, max_points, agg)
+                results[appliance_id] = (ts.astype('datetime64[ms]'), values)
+        return results
+
+    def _choose_tier(self, span_ms, max_points):
+        """Pick the finest tier with at most oversample * max_points points in the span."""
+        budget = max_points * self.oversample
+        for tier_seconds, table in self.TIERS:
+            if span_ms / (tier_seconds * 1000) <= budget:
+                return tier_seconds, table
+        return self.TIERS[-1]
+
+    # Block cache
+    def _read_range(self, appliance_id, tier_seconds, table, start_ms, end_ms):
+        """Concatenate the cached blocks covering a range and trim them to it."""
+        block_ms = tier_seconds * 1000 * self.BLOCK_POINTS
+        committed_ms = self._committed_ms()
+        parts = []
+        for block_start in range(start_ms - start_ms % block_ms, end_ms + 1, block_ms):
+            parts.append(self._get_block(appliance_id, tier_seconds, table, block_start, block_ms, committed_ms))
+
+        ts = np.concatenate([part[0] for part in parts])
+        first, last = np.searchsorted(ts, [start_ms, end_ms + 1])
+        return tuple(np.concatenate([part[i] for part in parts])[first:last] for i in range(4))
+
+    def _get_block(self, appliance_id, tier_seconds, table, block_start, block_ms, committed_ms):
+        """Return one block from the cache, reading it from the database on a miss."""
+        key = (appliance_id, tier_seconds, block_start)
+        block = self.cache.get(key)
+        if block is not None:
+            self.cache.move_to_end(key)
+            return block
+
+        block = self._fetch_block(appliance_id, table, block_start, block_start + block_ms)
+        # Only blocks that end before the newest committed sample are complete;
+        # SampleStore commits in batches, so later blocks may still gain rows
+        if committed_ms is not None and block_start + block_ms <= committed_ms:
+            self.cache[key] = block
+            if len(self.cache) > self.cache_blocks:
+                self.cache.popitem(last=False)
+        return block
+
+    def _connect(self):
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        return self.connection
+
+    def _committed_ms(self):
+        """Timestamp of the newest committed sample (one index lookup), or None."""
+        try:
+            return self._connect().execute("SELECT MAX(ts) FROM samples").fetchone()[0]
+        except sqlite3.OperationalError:
+            return None  # Store not created yet
+
+    def _fetch_block(self, appliance_id, table, start_ms, end_ms):
+        """Read one block as (ts, mean, min, max) arrays."""
+        self._connect()
+
+        if table == "samples":
+            sql = "SELECT ts, power, power, power FROM samples"
+        else:
+            sql = f"SELECT ts, total / count, minimum, maximum FROM {table}"
+        try:
+            rows = self.connection.execute(
+                sql + " WHERE appliance_id = ? AND ts >= ? AND ts < ? ORDER BY ts",
+                (appliance_id, start_ms, end_ms)).fetchall()
+        except sqlite3.OperationalError:
+            rows = []  # Store not created yet
+        data = np.array(rows, dtype=float).reshape(-1, 4)
+        return data[:, 0].astype(np.int64), data[:, 1], data[:, 2], data[:, 3]
+
+    def clear_cache(self):
+        """Drop all cached blocks."""
+        with self.lock:
+            self.cache.clear()
+
+    def close(self):
+        """Close the database connection."""
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    # Downsampling
+    def _downsample(self, ts, mean, minimum, maximum, start_ms, end_ms, max_points, agg):
+        """Reduce tier data to at most max_points points."""
+        # Rollup points carry their own extremes, so minmax still reduces them below
+        rollup_extremes = agg == "minmax" and not np.array_equal(minimum, maximum)
+        if len(ts) <= max_points and not rollup_extremes:
+            if agg == "min":
+                return ts, minimum
+            if agg == "max":
+                return ts, maximum
+            return ts, mean
+        if agg == "lttb":
+            return self._lttb(ts, mean, max_points)
+
+        buckets = max_points // 2 if agg == "minmax" else max_points
+        edges = np.linspace(start_ms, end_ms + 1, buckets + 1)
+        index = np.clip(np.searchsorted(edges, ts, side='right') - 1, 0, buckets - 1)
+        starts = np.flatnonzero(np.r_[True, index[1:] != index[:-1]])
+
+        if agg == "mean":
+            counts = np.diff(np.r_[starts, len(ts)])
+            # Offsets from the first sample keep the timestamp sums well inside int64
+            centres = ts[0] + np.add.reduceat(ts - ts[0], starts) // counts
+            return centres, np.add.reduceat(mean, starts) / counts
+        if agg == "min":
+            return ts[starts], np.minimum.reduceat(minimum, starts)
+        if agg == "max":
+            return ts[starts], np.maximum.reduceat(maximum, starts)
+
+        # minmax: emit both extremes of every bucket at the times they occurred
+        ends = np.r_[starts[1:], len(ts)]
+        low_at = np.array([start + np.argmin(minimum[start:end]) for start, end in zip(starts, ends)])
+        high_at = np.array([start + np.argmax(maximum[start:end]) for start, end in zip(starts, ends)])
+        first = np.minimum(low_at, high_at)
+        second = np.maximum(low_at, high_at)
+        order = np.column_stack([first, second]).ravel()
+        values = np.column_stack([
+            np.where(low_at <= high_at, minimum[low_at], maximum[high_at]),
+            np.where(low_at <= high_at, maximum[high_at], minimum[low_at]),
+        ]).ravel()
+        return ts[order], values
+
+    def _lttb(self, ts, values, max_points):
+        """Largest-triangle-three-buckets: keep the points that best preserve the shape."""
+        if max_points < 3:
+            return ts[[0, -1]][:max_points], values[[0, -1]][:max_points]
+        x = ts.astype(float)
+        edges = np.linspace(1, len(ts) - 1, max_points - 1).astype(int)
+        selected = [0]
+        for i in range(max_points - 2):
+            bucket_start, bucket_end = edges[i], max(edges[i + 1], edges[i] + 1)
+            next_start = bucket_end
+            next_end = edges[i + 2] if i + 2 < len(edges) else len(ts)
+            if next_start >= next_end:
+                next_x, next_y = x[-1], values[-1]
+            else:
+                next_x, next_y = x[next_start:next_end].mean(), values[next_start:next_end].mean()
+
+            previous = selected[-1]
+            area = np.abs((x[previous] - next_x) * (values[bucket_start:bucket_end] - values[previous]) -
+                          (x[previous] - x[bucket_start:bucket_end]) * (next_y - values[previous]))
+            selected.append(bucket_start + int(np.argmax(area)))
+        selected.append(len(ts) - 1)
+        return ts[selected], values[selected]
@@ -0,0 +1,130 @@
+import math
+
+
+class IntervalStats:
+    """
+    Streaming power statistics for one export interval.
+    Keeps count, sum, sum of squares, min and max, plus a fixed-memory P²
+    (Jain & Chlamtac) estimate of one quantile (p95 by default).
+    Every update is O(1); nothing is rescanned when the interval is reported.
+    """
+
+    def __init__(self, quantile=0.95):
+        """Initialize empty statistics tracking the given quantile."""
+        self.quantile = quantile
+        self.reset()
+
+    def reset(self):
+        """Clear all accumulators (called at every export boundary)."""
+        self.count = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.minimum = None
+        self.maximum = None
+
+        # P² markers: heights, actual positions, desired positions and their increments
+        q = self.quantile
+        self._heights = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5]
+        self._increments = [0, q / 2, q, (1 + q) / 2, 1]
+
+    def add(self, value):
+        """Add one sample to the interval."""
+        self.count += 1
+        self.total += value
+        self.total_squares += value * value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+        heights = self._heights
+        if len(heights) < 5:
+            # Collect the first five samples exactly
+            heights.append(value)
+            heights.sort()
+            return
+
+        # Find the cell the sample falls in, extending the extremes if needed
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+
+        positions = self._positions
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Adjust the three middle markers towards their desired positions
+        for i in range(1, 4):
+            offset = self._desired[i] - positions[i]
+            if ((offset >= 1 and positions[i + 1] - positions[i] > 1) or
+                    (offset <= -1 and positions[i - 1] - positions[i] < -1)):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, step)
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i, step):
+        """Piecewise-parabolic prediction of marker i moved by step."""
+        h, n = self._heights, self._positions
+        return h[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1]))
+
+    def _linear(self, i, step):
+        """Linear prediction of marker i moved by step."""
+        h, n = self._heights, self._positions
+        return h[i] + step * (h[i + step] - h[i]) / (n[i + step] - n[i])
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    @property
+    def std(self):
+        if not self.count:
+            return None
+        variance = self.total_squares / self.count - (self.total / self.count) ** 2
+        return math.sqrt(max(variance, 0.0))
+
+    @property
+    def percentile(self):
+        """Estimated quantile of the interval (exact up to five samples, while the markers are the samples)."""
+        if not self.count:
+            return None
+        heights = self._heights
+        if self.count <= 5:
+            rank = self.quantile * (len(heights) - 1)
+            lower = int(rank)
+            upper = min(lower + 1, len(heights) - 1)
+            return heights[lower] + (heights[upper] - heights[lower]) * (rank - lower)
+        return heights[2]
+
+    def copy(self):
+        """Return an independent copy of the accumulators."""
+        stats = IntervalStats(self.quantile)
+        stats.count = self.count
+        stats.total = self.total
+        stats.total_squares = self.total_squares
+        stats.minimum = self.minimum
+        stats.maximum = self.maximum
+        stats._heights = self._heights.copy()
+        stats._positions = self._positions.copy()
+        stats._desired = self._desired.copy()
+        return stats
+
+    def summary(self):
+        """Return (min, mean, max, p95) for the interval, all None if empty."""
+        return self.minimum, self.mean, self.maximum, self.percentile
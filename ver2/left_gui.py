@@ -1,10 +1,10 @@
 from tkinter import *
 from tkinter import messagebox as msgbox
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import datetime
+import threading
+import time
 from datetime import datetime, timedelta
-import matplotlib.dates as mdates
+import numpy as np
 from appliance import Appliance_Summary
 
 
@@ -13,14 +13,22 @@ class Left_GUI:
     Left GUI class handles the graphical display and properties panel of appliances.
     Contains a real-time power consumption graph and detailed appliance statistics.
     """
-    def __init__(self, root, data):
+    def __init__(self, root, data, renderer="matplotlib", history_length=300):
         """
         Initialize the Left GUI component.
+        renderer selects the live graph: "matplotlib" or the lightweight "canvas".
+        history_length is the power buffer length, and so the graph window, in seconds.
         """
         self.root = root
         self.data = data 
+        self.renderer = renderer
+        self.history_length = history_length
         self.current_appliance = None  # Track currently displayed appliance
         self.appliances = {}  # Reference to all appliances for summary view
+        self.current_layout = None  # Properties layout currently gridded
+        self.label_texts = {}  # Last text set on each value label
+        self.render_monitor = None  # Optional RenderMonitor timing each graph frame
+        self.on_graph_ready = None  # Called with the matplotlib import time once the graph exists
         
         # Initialize GUI components
         self.addFrame()
@@ -56,6 +64,7 @@ class Left_GUI:
         # Setup initial components
         self.setup_graph()
         self.setup_individual_appliance_layout()
+        self.current_layout = "individual"
 
     def _create_property_labels(self):
         """
@@ -83,31 +92,15 @@ class Left_GUI:
 
     def setup_graph(self):
         """
-        Initialize the matplotlib graph for displaying real-time power consumption.
-        Creates a fixed 5-minute time window that scrolls with current time.
+        Initialize the graph for displaying real-time power consumption.
+        Creates a fixed time window, one power buffer long, that scrolls with current time.
         """
-        # Create matplotlib figure and axis
-        self.fig = plt.Figure(figsize=(5, 3.5), dpi=80)
-        self.ax = self.fig.add_subplot(111)
-        
-        # Configure graph appearance
-        self.ax.set_xlabel('Time (HH:MM)')
-        self.ax.set_ylabel('Power (W)')
-        self.ax.grid(True)
-        
-        # Initialize fixed 5-minute time window
-        current_time = datetime.now()
-        start_time = current_time - timedelta(seconds=299)  # 299 seconds = ~5 minutes
-        end_time = current_time
-    
-        # Create time axis with 1-second intervals (300 data points)
-        self.time_axis = []
-        for i in range(300):
-            timestamp = start_time + timedelta(seconds=i)
-            self.time_axis.append(timestamp)
-    
-        # Initialize power data line with zeros
-        self.line, = self.ax.plot(self.time_axis, [0] * 300)
+        # Window in seconds relative to now (history_length data points, 1-second intervals).
+        # The graph plots against absolute time: these offsets plus the epoch time of
+        # the newest sample, so gridlines and labels scroll with the data.
+        self.time_axis = np.arange(-self.history_length + 1, 1, dtype=float)
+        self.axis_origin = datetime.now()  # Clock time of the newest sample (offset 0)
+        self.time_values = self.time_axis + self.axis_origin.timestamp()
         
         # Initialize storage for multiple lines (for summary view)
         self.appliance_lines = {}  # Store individual appliance lines
@@ -129,22 +122,100 @@ class Left_GUI:
             '#dc143c'   # Crimson
         ]
         
-        # Set fixed x-axis limits for the time window
-        self.ax.set_xlim(start_time, end_time)
-        
-        # Configure time formatting for better readability
-        self.ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-        self.ax.xaxis.set_major_locator(mdates.MinuteLocator(interval=1))
-        plt.setp(self.ax.xaxis.get_majorticklabels(), rotation=0, ha='right')
-        
         # Initialize data counter for tracking updates
         self.data_count = 0
         
+        # Y-range currently shown; kept until the data fills less than y_shrink_ratio of it
+        self.y_limits = None
+        self.y_shrink_ratio = 0.6
+        
+        if self.renderer == "canvas":
+            # Lightweight Tk Canvas renderer, no matplotlib needed
+            from canvas_graph import CanvasGraph
+            self.graph = CanvasGraph(self.frame_graph, window_seconds=len(self.time_axis))
+            self.graph_ready = True
+            return
+        
+        # matplotlib takes longer to import than the rest of the GUI together, so
+        # the window is shown first and it is loaded on a worker thread once Tk is idle
+        self.graph_ready = False
+        self.label_graph_loading = Label(self.frame_graph, text="Loading graph...", bg="white")
+        self.label_graph_loading.grid(column=0, row=2, columnspan=3, sticky=NSEW)
+        self.root.after_idle(lambda: threading.Thread(target=self._import_matplotlib, daemon=True).start())
+
+    def _import_matplotlib(self):
+        """Import matplotlib (worker thread), then create the figure on the GUI thread."""
+        import_start = time.perf_counter()
+        import matplotlib.pyplot
+        import matplotlib.backends.backend_tkagg
+        import_time = time.perf_counter() - import_start
+        self.root.after(0, self._create_figure, import_time)
+
+    def _create_figure(self, import_time=0):
+        """
+        Create the matplotlib graph in the graph frame and show the current appliance.
+        """
+        # Imported here so the canvas renderer never loads matplotlib
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.ticker import FuncFormatter, MultipleLocator
+        from matplotlib.collections import PolyCollection
+        
+        # Create matplotlib figure and axis
+        self.fig = plt.Figure(figsize=(5, 3.5), dpi=80)
+        self.ax = self.fig.add_subplot(111)
+        
+        # Configure graph appearance
+        self.ax.set_xlabel('Time (HH:MM)')
+        self.ax.set_ylabel('Power (W)')
+        self.ax.grid(True)
+    
+        # Initialize power data line with zeros
+        self.line, = self.ax.plot(self.time_values, [0] * len(self.time_axis))
+        
+        # Summary view: stacked contribution bands (one polygon per appliance and
+        # direction) in a single collection, with the net power line on top
+        self.stack = PolyCollection([], linewidths=0, alpha=0.8, antialiased=False, animated=True, visible=False)
+        self.ax.add_collection(self.stack, autolim=False)
+        self.stack_names = []
+        self.stack_verts = None  # Band vertices last set on the collection
+        
+        # X-axis limits follow the time window
+        self.ax.set_xlim(self.time_values[0], self.time_values[-1])
+        
+        # Configure time formatting for better readability: a tick on every whole
+        # minute (multiples of 60 epoch seconds), labelled with its clock time
+        self.ax.xaxis.set_major_formatter(FuncFormatter(self._format_time_tick))
+        self.ax.xaxis.set_major_locator(MultipleLocator(60))
+        plt.setp(self.ax.xaxis.get_majorticklabels(), rotation=0, ha='right')
+        
         # Embed matplotlib canvas in tkinter frame
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.frame_graph)
         self.canvas.get_tk_widget().grid(
             column=0, row=2, columnspan=3, sticky=NSEW
         )
+        
+        # Blitting: axes, y grid, y ticks and legend are cached as a background image.
+        # The power lines and the x-axis (whose ticks and gridlines scroll with the
+        # data) are animated and redrawn each tick
+        self.line.set_animated(True)
+        self.ax.xaxis.set_animated(True)
+        self.background = None
+        self.background_key = None
+        self.legend_region = None  # Legend pixels, drawn over the summary bands
+        self.layout_version = 0  # Bumped whenever lines or the legend are added/removed
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        
+        self.label_graph_loading.destroy()
+        self.graph_ready = True
+        if self.current_appliance is not None:
+            self.update_graph(self.current_appliance)
+        if self.on_graph_ready:
+            self.on_graph_ready(import_time)
+
+    def _format_time_tick(self, value, position):
+        """Label an x value (epoch seconds) with its clock time."""
+        return datetime.fromtimestamp(value).strftime('%H:%M')
 
     def update_graph(self, appliance):
         """
@@ -153,20 +224,72 @@ class Left_GUI:
         if appliance is None:
             return
             
+        # A different appliance gets a fresh y-range
+        if appliance is not self.current_appliance:
+            self.y_limits = None
+        
         # Store reference to current appliance for refresh operations
         self.current_appliance = appliance
+        if not self.graph_ready:
+            return  # Drawn as soon as the graph has been created
+        render_start = time.perf_counter()
         
-        # Check if this is a summary view
-        if isinstance(appliance, Appliance_Summary):
-            self._update_summary_graph(appliance)
+        if self.renderer == "canvas":
+            self._update_canvas_graph(appliance)
         else:
-            self._update_individual_graph(appliance)
-        
-        # Optimize layout to prevent label cutoff
-        self.fig.tight_layout()
+            # Move the window to the newest sample: one vector add
+            self.time_values = self.time_axis + self.axis_origin.timestamp()
+            self.ax.set_xlim(self.time_values[0], self.time_values[-1])
+            
+            # Check if this is a summary view
+            if isinstance(appliance, Appliance_Summary):
+                self._update_summary_graph(appliance)
+            else:
+                self._update_individual_graph(appliance)
+            
+            # Refresh the display
+            self._render()
         
-        # Refresh the display
-        self.canvas.draw()
+        if self.render_monitor is not None:
+            self.render_monitor.record_frame(time.perf_counter() - render_start)
+
+    def _render_key(self):
+        """Everything that is baked into the cached background (the x-axis is animated)."""
+        return (self.ax.get_ylim(), tuple(self.fig.bbox.bounds), self.layout_version)
+
+    def _render(self):
+        """
+        Full redraw when the limits, size or layout changed since the background
+        was cached; otherwise restore the background and blit only the lines.
+        """
+        if self.background is None or self._render_key() != self.background_key:
+            # Optimize layout to prevent label cutoff
+            self.fig.tight_layout()
+            self.canvas.draw()  # Caches the new background in _on_draw
+        else:
+            self.canvas.restore_region(self.background)
+            self._draw_animated()
+            self.canvas.blit(self.fig.bbox)  # Includes the x tick labels below the axes
+
+    def _on_draw(self, event):
+        """Cache the background after every full draw (including resizes), then add the lines."""
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.background_key = self._render_key()
+        legend = self.ax.get_legend()
+        self.legend_region = None
+        if legend is not None and legend.get_visible():
+            self.legend_region = self.canvas.copy_from_bbox(legend.get_window_extent())
+        self._draw_animated()
+
+    def _draw_animated(self):
+        """Draw the x-axis and the animated line artists over the current background."""
+        self.ax.draw_artist(self.ax.xaxis)  # Gridlines first, under the data
+        for artist in [self.stack, self.line, *self.appliance_lines.values()]:
+            if artist.get_visible():
+                self.ax.draw_artist(artist)
+        # Paste the cached legend back over the bands
+        if self.legend_region is not None and self.stack.get_visible():
+            self.canvas.restore_region(self.legend_region)
 
     def _update_individual_graph(self, appliance):
         """
@@ -176,74 +299,80 @@ class Left_GUI:
         self._clear_appliance_lines()
         
         # Show the main line and hide legend
+        if not self.line.get_visible():
+            self.layout_version += 1
         self.line.set_visible(True)
         self.ax.legend().set_visible(False) if self.ax.get_legend() else None
         
         # Get the appliance's power history data
-        power_history = appliance.get_power_history()
+        power_history = self._window_history(appliance)
         
-        # Update only the power values, x-axis remains fixed
-        self.line.set_ydata(power_history)
+        # Update the power values at the current times
+        self.line.set_data(self.time_values, power_history)
         
         # Configure graph labels
         self.ax.set_ylabel('Power (W)')
         
         # Calculate appropriate y-axis limits
-        self._calculate_y_axis_limits(power_history, appliance)
+        self._calculate_y_axis_limits(appliance)
 
     def _update_summary_graph(self, summary_appliance):
         """
         Update graph for summary view.
         """
         # Hide the main line for summary view
+        if self.line.get_visible():
+            self.layout_version += 1
         self.line.set_visible(False)
+        self.stack.set_visible(True)
         
         # Get all appliances
         appliances = self._get_all_appliances()
-        
-        # Clear existing appliance lines
-        self._clear_appliance_lines()
-        
-        # Create lines for each individual appliance
-        color_index = 0
-        max_power = 0
-        min_power = 0
-        
-        for name, appliance in appliances.items():
-            if name == "All" or appliance is None:
-                continue
-                
-            # Get power history for this appliance
-            power_history = appliance.get_power_history()
-            if not power_history:
-                continue
-            
-            # Get color for this appliance
-            color = self.appliance_colors[color_index % len(self.appliance_colors)]
-            
-            # Create line for this appliance
-            line, = self.ax.plot(self.time_axis, power_history, 
-                               label=f"{name}", color=color, linewidth=2)
-            self.appliance_lines[name] = line
-            
-            # Track min/max for y-axis scaling
-            max_power = max(max_power, max(power_history))
-            min_power = min(min_power, min(power_history))
-            
-            color_index += 1
-        
-        # Add net power line (consumption - generation)
-        net_power_history = summary_appliance.get_power_history()
-        net_line, = self.ax.plot(self.time_axis, net_power_history, 
-                               label="Net Power", color='black', linewidth=2)
-        self.appliance_lines["Net Power"] = net_line
-        
-        # Include net power in min/max calculations
-        if net_power_history:
-            max_power = max(max_power, max(net_power_history))
-            min_power = min(min_power, min(net_power_history))
+        names = [name for name, appliance in appliances.items() if name != "All" and appliance is not None]
+        
+        # Colors and legend are only rebuilt when the set of appliances changes
+        if self.stack_names != names or "Net Power" not in self.appliance_lines:
+            self._rebuild_summary_lines(names)
+        
+        # Contributions: loads (and storage) count upward, sources downward.
+        # Positive and negative parts are stacked separately with one cumsum.
+        contributions = self._fleet_history_matrix([appliances[name] for name in names])
+        parts = np.stack((np.maximum(contributions, 0), np.minimum(contributions, 0)))
+        upper = np.cumsum(parts, axis=1).reshape(-1, len(self.time_axis))
+        lower = upper - parts.reshape(-1, len(self.time_axis))
+        
+        # Each band is the polygon between its lower and upper edge; empty bands
+        # (e.g. the downward part of a load) are left out of the collection
+        filled = np.flatnonzero(np.any(parts.reshape(len(upper), -1), axis=1))
+        points = len(self.time_axis)
+        verts = np.empty((len(filled), 2 * points, 2))
+        verts[:, :points, 0] = self.time_values
+        verts[:, :points, 1] = upper[filled]
+        verts[:, points:, 0] = self.time_values[::-1]
+        verts[:, points:, 1] = lower[filled, ::-1]
+        self.stack.set_verts(verts)
+        self.stack_verts = verts  # Kept so scroll_graph can shift the bands
+        self.stack.set_facecolor(self.stack_colors[filled])
+        
+        # Update net power line (consumption - generation)
+        net_power_history = self._window_history(summary_appliance)
+        self.appliance_lines["Net Power"].set_data(self.time_values, net_power_history)
+        
+        # The stack totals bound the bands; include net power as well
+        net_min, net_max = summary_appliance.power_range()
+        max_power = max(0, float(upper[len(names) - 1].max()) if names else 0, net_max)
+        min_power = min(0, float(upper[-1].min()) if names else 0, net_min)
         
         # Update y-axis limits based on all appliances with 10% padding
+        self._apply_y_limits(self._summary_y_limits(min_power, max_power))
+        
+        # Configure graph labels
+        self.ax.set_ylabel('Power (W)')
+
+    def _summary_y_limits(self, min_power, max_power):
+        """
+        Y-axis limits for the summary view with 10% padding.
+        """
         if max_power > 0 or min_power < 0:
             # Calculate 10% padding based on the maximum absolute value
             y_range = max_power - min_power
@@ -252,22 +381,98 @@ class Left_GUI:
             # Set minimum to 0 unless there are negative values
             y_min = min_power - y_padding if min_power < 0 else 0
             y_max = max_power + y_padding
+            return y_min, y_max
+        return 0, 10
+
+    def _update_canvas_graph(self, appliance):
+        """
+        Update the lightweight canvas graph for an individual appliance or the summary.
+        """
+        if isinstance(appliance, Appliance_Summary):
+            appliances = self._get_all_appliances()
+            names = [name for name, item in appliances.items() if name != "All" and item is not None]
+            # Unsampled appliances draw zeros without allocating a buffer
+            series = {name: self._window_history(appliances[name]) for name in names}
+            series["Net Power"] = self._window_history(appliance)
             
-            self.ax.set_ylim(y_min, y_max)
+            colors = {name: self.appliance_colors[index % len(self.appliance_colors)]
+                      for index, name in enumerate(names)}
+            colors["Net Power"] = 'black'
+            self.graph.set_series(colors)
+            
+            ranges = [appliances[name].power_range() for name in names] + [appliance.power_range()]
+            max_power = max(0, max(high for _, high in ranges))
+            min_power = min(0, min(low for low, _ in ranges))
+            self.graph.set_y_limits(*self._stable_y_limits(self._summary_y_limits(min_power, max_power)))
         else:
-            self.ax.set_ylim(0, 10)
-        
-        # Configure graph labels and legend 
-        self.ax.set_ylabel('Power (W)')
-        self.ax.legend(loc='upper left', fontsize=8)
+            series = {"Power": self._window_history(appliance)}
+            self.graph.set_series({"Power": self.appliance_colors[0]}, show_legend=False)
+            self.graph.set_y_limits(*self._stable_y_limits(self._individual_y_limits(appliance)))
+        
+        self.graph.set_time_origin(self.axis_origin)
+        for name, history in series.items():
+            self.graph.update_series(name, history)
+
+    def _rebuild_summary_lines(self, names):
+        """
+        Match the stacked bands to the current appliances: recolor the band
+        collection, create the net power line if needed, then rebuild the
+        legend once.
+        """
+        from matplotlib.patches import Patch
+        from matplotlib.colors import to_rgba_array
+        
+        colors = [self.appliance_colors[index % len(self.appliance_colors)] for index in range(len(names))]
+        # Upward bands first, then downward bands, in the same appliance order
+        self.stack_colors = to_rgba_array(colors * 2)
+        self.stack_names = list(names)
+        
+        # Net power line always on top, in black
+        if "Net Power" not in self.appliance_lines:
+            net_line, = self.ax.plot(self.time_values, [0] * len(self.time_axis),
+                                   label="Net Power", color='black', linewidth=2, animated=True)
+            self.appliance_lines["Net Power"] = net_line
+        
+        handles = [Patch(facecolor=color, alpha=0.8) for color in colors]
+        handles.append(self.appliance_lines["Net Power"])
+        self.ax.legend(handles, names + ["Net Power"], loc='upper left', fontsize=8)
+        self.layout_version += 1
+
+    def _window_history(self, appliance):
+        """Power history fitted to the time window, zero-padded on the left."""
+        points = len(self.time_axis)
+        history = np.zeros(points)
+        if appliance.has_history():
+            recent = appliance.power[-points:]
+            history[points - len(recent):] = recent
+        return history
+
+    def _fleet_history_matrix(self, appliances):
+        """
+        Power histories of the appliances as one (appliances x window) array,
+        sources negated. Unsampled appliances stay zero without allocating a buffer.
+        """
+        points = len(self.time_axis)
+        matrix = np.zeros((len(appliances), points))
+        for row, appliance in enumerate(appliances):
+            if appliance.has_history():
+                history = appliance.power[-points:]
+                matrix[row, points - len(history):] = history
+            if appliance.type == 1:
+                matrix[row] = -matrix[row]
+        return matrix
 
     def _clear_appliance_lines(self):
         """
         Clear all individual appliance lines from the graph.
         """
+        if self.appliance_lines or self.stack.get_visible():
+            self.layout_version += 1
         for line in self.appliance_lines.values():
             line.remove()
         self.appliance_lines.clear()
+        self.stack.set_visible(False)
+        self.stack_names = []
         
         # Clear legend if it exists
         if self.ax.get_legend():
@@ -279,16 +484,40 @@ class Left_GUI:
         """
         return self.appliances
 
-    def _calculate_y_axis_limits(self, power_history, appliance):
+    def _calculate_y_axis_limits(self, appliance):
         """
         Calculate and set appropriate y-axis limits for the graph.
         """
-        if not power_history:
-            self.ax.set_ylim(0, 10)
-            return
-            
-        max_value = max(power_history)
-        min_value = min(power_history)
+        self._apply_y_limits(self._individual_y_limits(appliance))
+
+    def _stable_y_limits(self, target):
+        """
+        Y-axis limits with hysteresis: grow as soon as the data needs more room,
+        but keep the current range until the data would fill less than
+        y_shrink_ratio of it, so the axis does not rescale on every tick.
+        """
+        current = self.y_limits
+        if current is not None:
+            fits = current[0] <= target[0] and target[1] <= current[1]
+            if fits and target[1] - target[0] >= self.y_shrink_ratio * (current[1] - current[0]):
+                return current
+        self.y_limits = target
+        return target
+
+    def _apply_y_limits(self, target):
+        """
+        Set the matplotlib y-limits only when the (hysteresis) range changes.
+        """
+        limits = self._stable_y_limits(target)
+        if tuple(self.ax.get_ylim()) != tuple(limits):
+            self.ax.set_ylim(*limits)
+
+    def _individual_y_limits(self, appliance):
+        """
+        Y-axis limits for one appliance's history with 10% padding.
+        """
+        # Rolling extrema kept with the history, so no rescan of the buffer
+        min_value, max_value = appliance.power_range()
         
         # Handle summary appliances (can have negative net power)
         if isinstance(appliance, Appliance_Summary):
@@ -305,7 +534,34 @@ class Left_GUI:
             y_min = 0
             y_max = max_value + max_value * 0.1 if max_value > 0 else 10
         
-        self.ax.set_ylim(y_min, y_max)
+        return y_min, y_max
+
+    def graph_signature(self):
+        """
+        Key describing what the graph currently shows, or None while it is scrolling.
+        A history that is flat (e.g. an appliance that is OFF) looks identical after
+        every shift, so the series only need recomputing when the key changes;
+        in between, scroll_graph moves the time axis.
+        """
+        appliance = self.current_appliance
+        if appliance is None:
+            return None
+        if isinstance(appliance, Appliance_Summary):
+            series = [a for name, a in self.appliances.items() if name != "All" and a is not None]
+            series.append(appliance)
+        else:
+            series = [appliance]
+        
+        values = []
+        for item in series:
+            if not item.has_history():
+                values.append(0)  # Never sampled a non-zero value
+                continue
+            min_value, max_value = item.power_range()
+            if min_value != max_value:
+                return None
+            values.append(max_value)
+        return (id(appliance), len(self.appliances), tuple(values))
 
     def refresh_current_graph(self):
         """
@@ -315,24 +571,8 @@ class Left_GUI:
         if self.current_appliance is None:
             return
             
-        # Update time window to current 5-minute window
-        current_time = datetime.now()
-        start_time = current_time - timedelta(seconds=299)
-        end_time = current_time
-        
-        # Update the time axis to maintain a scrolling 5-minute window
-        for i in range(300):
-            self.time_axis[i] = start_time + timedelta(seconds=i)
-        
-        # Update x-axis limits to current time window
-        self.ax.set_xlim(start_time, end_time)
-        
-        # Update the line's x-data with new time axis
-        self.line.set_xdata(self.time_axis)
-        
-        # Update all appliance lines' x-data if in summary view
-        for line in self.appliance_lines.values():
-            line.set_xdata(self.time_axis)
+        # Slide the 5-minute window to the current time
+        self.axis_origin = datetime.now()
         
         # Increment data counter for tracking
         self.data_count += 1
@@ -340,6 +580,30 @@ class Left_GUI:
         # Refresh the graph with current appliance data
         self.update_graph(self.current_appliance)
 
+    def scroll_graph(self):
+        """
+        Slide the time window to the current time without recomputing the series.
+        Used when graph_signature is unchanged: the lines keep their shape and
+        only their times, the x-limits and the animated x-axis move.
+        """
+        if self.current_appliance is None or not self.graph_ready:
+            return
+        self.axis_origin = datetime.now()
+        if self.renderer == "canvas":
+            self.graph.set_time_origin(self.axis_origin)
+            return
+        
+        shift = self.axis_origin.timestamp() - self.time_values[-1]
+        self.time_values = self.time_axis + self.axis_origin.timestamp()
+        self.ax.set_xlim(self.time_values[0], self.time_values[-1])
+        for line in [self.line, *self.appliance_lines.values()]:
+            if line.get_visible():
+                line.set_xdata(self.time_values)
+        if self.stack.get_visible() and self.stack_verts is not None:
+            self.stack_verts[..., 0] += shift
+            self.stack.set_verts(self.stack_verts)
+        self._render()
+
     def setup_individual_appliance_layout(self):
         """
         Configure the properties panel layout for individual appliances.
@@ -508,12 +772,12 @@ class Left_GUI:
         energy_used = getattr(appliance, 'energy_used', 0)  # Already in Wh
         
         # Format and display load appliance statistics
-        self.label_stats1_value.config(text=f"{current_power:.1f} W")
-        self.label_stats2_value.config(text=f"{appliance.pwm:.1f} %")
-        self.label_stats3_value.config(text=f"{appliance.fm:.2f} kHz")
-        self.label_stats4_value.config(text=f"{energy_used:.1f} Wh")
-        self.label_stats5_value.config(text=f"{appliance.time_operated} sec")
-        self.label_stats6_value.config(text="Fault" if appliance.fault else "No Fault")
+        self._set_label_text(self.label_stats1_value, f"{current_power:.1f} W")
+        self._set_label_text(self.label_stats2_value, f"{appliance.pwm:.1f} %")
+        self._set_label_text(self.label_stats3_value, f"{appliance.fm:.2f} kHz")
+        self._set_label_text(self.label_stats4_value, f"{energy_used:.1f} Wh")
+        self._set_label_text(self.label_stats5_value, f"{appliance.time_operated} sec")
+        self._set_label_text(self.label_stats6_value, "Fault" if appliance.fault else "No Fault")
 
     def _update_source_display(self, appliance):
         """
@@ -526,12 +790,12 @@ class Left_GUI:
         energy_generated = getattr(appliance, 'energy_used', 0)  # Already in Wh (for sources, this represents generated)
         
         # Format and display source appliance statistics
-        self.label_stats1_value.config(text=f"{current_power:.1f} W")
-        self.label_stats2_value.config(text=f"{duty_cycle:.1f} %")
-        self.label_stats3_value.config(text=f"{frequency:.2f} kHz")
-        self.label_stats4_value.config(text=f"{energy_generated:.1f} Wh")
-        self.label_stats5_value.config(text=f"{appliance.time_operated} sec")
-        self.label_stats6_value.config(text="Fault" if appliance.fault else "No Fault")
+        self._set_label_text(self.label_stats1_value, f"{current_power:.1f} W")
+        self._set_label_text(self.label_stats2_value, f"{duty_cycle:.1f} %")
+        self._set_label_text(self.label_stats3_value, f"{frequency:.2f} kHz")
+        self._set_label_text(self.label_stats4_value, f"{energy_generated:.1f} Wh")
+        self._set_label_text(self.label_stats5_value, f"{appliance.time_operated} sec")
+        self._set_label_text(self.label_stats6_value, "Fault" if appliance.fault else "No Fault")
 
     def _update_storage_display(self, appliance):
         """
@@ -555,12 +819,24 @@ class Left_GUI:
             state = "Storing"
         
         # Format and display storage appliance statistics
-        self.label_stats1_value.config(text=f"{soc:.1f} %")
-        self.label_stats2_value.config(text=f"{duty_cycle:.1f} %")
-        self.label_stats3_value.config(text=f"{frequency:.2f} kHz")
-        self.label_stats4_value.config(text=state)
-        self.label_stats5_value.config(text=f"{energy_stored:.1f} Wh")
-        self.label_stats6_value.config(text="Fault" if appliance.fault else "No Fault")
+        self._set_label_text(self.label_stats1_value, f"{soc:.1f} %")
+        self._set_label_text(self.label_stats2_value, f"{duty_cycle:.1f} %")
+        self._set_label_text(self.label_stats3_value, f"{frequency:.2f} kHz")
+        self._set_label_text(self.label_stats4_value, state)
+        self._set_label_text(self.label_stats5_value, f"{energy_stored:.1f} Wh")
+        self._set_label_text(self.label_stats6_value, "Fault" if appliance.fault else "No Fault")
+
+    def _apply_layout(self, layout, setup_method):
+        """Re-grid the properties panel only when the layout actually changes."""
+        if layout != self.current_layout:
+            setup_method()
+            self.current_layout = layout
+
+    def _set_label_text(self, label, text):
+        """Configure a value label only when its text changed."""
+        if self.label_texts.get(label) != text:
+            label.config(text=text)
+            self.label_texts[label] = text
 
     def update_appliance_display(self, appliance):
         """
@@ -577,21 +853,13 @@ class Left_GUI:
         """
         Update display for Appliance_Summary objects.
         """
-        self.setup_summary_layout()
+        self._apply_layout("summary", self.setup_summary_layout)
         
         # Format and display summary statistics
-        self.label_stats1_value.config(
-            text=f"{appliance.total_power_consumption:.1f} W"
-        )
-        self.label_stats2_value.config(
-            text=f"{appliance.total_power_generation:.1f} W"
-        )
-        self.label_stats3_value.config(
-            text=f"{appliance.total_energy_consumption:.3f} Wh"
-        )
-        self.label_stats4_value.config(
-            text=f"{appliance.total_energy_generated:.3f} Wh"
-        )
+        self._set_label_text(self.label_stats1_value, f"{appliance.total_power_consumption:.1f} W")
+        self._set_label_text(self.label_stats2_value, f"{appliance.total_power_generation:.1f} W")
+        self._set_label_text(self.label_stats3_value, f"{appliance.total_energy_consumption:.3f} Wh")
+        self._set_label_text(self.label_stats4_value, f"{appliance.total_energy_generated:.3f} Wh")
     
     def _update_individual_display(self, appliance):
         """
@@ -602,14 +870,14 @@ class Left_GUI:
         appliance_type = getattr(appliance, 'type', 0)
         
         if appliance_type == 0:  # Load
-            self._setup_load_layout()
+            self._apply_layout("load", self._setup_load_layout)
             self._update_load_display(appliance)
         elif appliance_type == 1:  # Source
-            self._setup_source_layout()
+            self._apply_layout("source", self._setup_source_layout)
             self._update_source_display(appliance)
         elif appliance_type == 2:  # Storage
-            self._setup_storage_layout()
+            self._apply_layout("storage", self._setup_storage_layout)
             self._update_storage_display(appliance)
         else:  # Default/Unknown type
-            self._setup_load_layout()  # Default to load layout
+            self._apply_layout("load", self._setup_load_layout)  # Default to load layout
             self._update_load_display(appliance)
@@ -1,43 +1,59 @@
-from appliance import Appliance, Appliance_Summary
+import time
+startup_start = time.perf_counter()  # Start-up timings are measured from here
+
+# Only what the first window needs is imported up front; data services are
+# imported after the first paint, matplotlib on a worker thread and openpyxl
+# by the first export
 from randomvaluegenerator import RandomValueGenerator
-from dataupdatemanager import DataUpdateManager
 from upper_gui import Upper_GUI
 from left_gui import Left_GUI
 from right_gui import Right_GUI
 from root_gui import RootGUI
+from fleet_snapshot import FleetSnapshot
+from fleet_config import FleetConfig
+from render_monitor import RenderMonitor
+import argparse
+import os
 
 if __name__ == "__main__":
-    # Create individual appliances
-    washing_machine = Appliance("Washing Machine", 1)
-    washing_machine.power_rating = 500
-    washing_machine.voltage_rating = 250
-    washing_machine.type = 0  # Load
-    
-    air_conditioner = Appliance("Air Conditioner", 2)
-    air_conditioner.power_rating = 1200
-    air_conditioner.voltage_rating = 200
-    air_conditioner.type = 0  # Load
-    
-    heater = Appliance("Heater", 3)
-    heater.power_rating = 800
-    heater.voltage_rating = 150
-    heater.type = 0  # Load
-    
-    # Create summary appliance
-    appliance_summary = Appliance_Summary("All", 0)
-    
-    appliances = {
-        "All": appliance_summary,
-        "Washing Machine": washing_machine,
-        "Air Conditioner": air_conditioner,
-        "Heater": heater
-    }
-    
-    # Create random value generator and set variation percentages
+    parser = argparse.ArgumentParser(description="DC nanogrid control panel")
+    parser.add_argument("--renderer", choices=["matplotlib", "canvas"], default="matplotlib",
+                        help="live graph renderer; canvas is lighter and does not load matplotlib")
+    parser.add_argument("--perf-overlay", action="store_true",
+                        help="show the render-performance overlay at start-up (F12 toggles it)")
+    parser.add_argument("--profile-gui", type=float, metavar="SECONDS",
+                        help="save a cProfile capture of the first SECONDS of the GUI thread")
+    parser.add_argument("--export-formats", nargs="+", choices=["xlsx", "csv", "parquet", "arrow"],
+                        default=["xlsx"], metavar="FORMAT",
+                        help="export backends written every 5 minutes: xlsx, csv, parquet, arrow "
+                             "(parquet and arrow need pyarrow)")
+    parser.add_argument("--export-file-mode", choices=["interval", "daily"], default="interval",
+                        help="Excel exports: a workbook per export, or one workbook per day built at midnight")
+    parser.add_argument("--export-history", choices=["recent", "full"], default="recent",
+                        help="Excel exports: last 10 readings only, or every buffered sample on a Power History sheet")
+    parser.add_argument("--retention-days", type=int, default=365, metavar="DAYS",
+                        help="delete exports and stored samples older than DAYS (0 keeps everything)")
+    parser.add_argument("--max-disk-mb", type=float, default=2048, metavar="MB",
+                        help="disk ceiling for exports and stored samples; the oldest data is deleted first "
+                             "(0 disables the ceiling)")
+    args = parser.parse_args()
+    import_time = time.perf_counter() - startup_start
+
+    # Stage 1: the window with the last-known values
+    # Build the fleet from the fleet file (built-in appliances if there is none)
+    restore_start = time.perf_counter()
     value_generator = RandomValueGenerator()
-    value_generator.set_appliance_variation("Washing Machine", 5)  # 5% variation
-    value_generator.set_appliance_variation("Air Conditioner", 5)  # 5% variation
-    value_generator.set_appliance_variation("Heater", 1)  # 1% variation
+    fleet_config = FleetConfig()
+    appliances = fleet_config.load(value_generator)
+    appliance_summary = appliances["All"]
+
+    # Restore appliances added from the GUI, counters and history from the last snapshot.
+    # Saved settings win unless the fleet file was edited after the snapshot was taken.
+    fleet_snapshot = FleetSnapshot()
+    restore_settings = (not fleet_config.exists() or not os.path.exists(fleet_snapshot.path) or
+                        os.path.getmtime(fleet_snapshot.path) > os.path.getmtime(fleet_config.path))
+    restored_from = fleet_snapshot.restore(appliances, value_generator, restore_settings)
+    restore_time = time.perf_counter() - restore_start
 
     # Initialize summary with current appliance data
     appliance_summary.update_from_appliances(appliances)
@@ -47,21 +63,59 @@ if __name__ == "__main__":
     upper_gui = Upper_GUI(root_gui.root, None, appliances) 
     right_gui = Right_GUI(root_gui.root, upper_gui)
     upper_gui.right_gui = right_gui
-    left_gui = Left_GUI(root_gui.root, 0)
+    left_gui = Left_GUI(root_gui.root, 0, renderer=args.renderer, history_length=appliance_summary.history_length)
     left_gui.set_appliances(appliances)  # Set appliances reference for multi-line graphs
     upper_gui.left_gui = left_gui
-
-    # Create and start data update manager
-    data_manager = DataUpdateManager(appliances, value_generator, left_gui, right_gui)
-    data_manager.start_updates()
+    
+    # Render-performance overlay (F12) and GUI thread profiler (Shift+F12)
+    render_monitor = RenderMonitor(root_gui.root, log=right_gui.log_events)
+    left_gui.render_monitor = render_monitor
+    if args.perf_overlay:
+        render_monitor.show()
+    if args.profile_gui:
+        render_monitor.start_profile(args.profile_gui)
+    left_gui.on_graph_ready = lambda matplotlib_time: right_gui.log_events(
+        f"Graph ready after {time.perf_counter() - startup_start:.2f} s (matplotlib import {matplotlib_time:.2f} s)")
 
     # Initialize with first appliance selected
     initial_appliance = upper_gui.get_current_appliance()
     left_gui.update_appliance_display(initial_appliance)
     left_gui.update_graph(initial_appliance)
+    
+    # First paint before anything else is loaded
+    root_gui.root.update()
+    first_paint_time = time.perf_counter() - startup_start
+
+    # Stage 2: recovery and data services
+    from sample_log import SampleLog
+    from dataupdatemanager import DataUpdateManager
+    if not restored_from:
+        # Without a snapshot, restore energy counters and recent history from the newest export
+        from history_loader import HistoryLoader
+        restored_from = HistoryLoader(history_length=appliance_summary.history_length).restore(appliances)
+    # Then recover anything newer from the crash-safe sample log
+    recovered_samples = SampleLog().restore_recent(appliances)
+    appliance_summary.update_from_appliances(appliances)
+
+    # Create and start data update manager
+    export_options = {"xlsx": {"file_mode": args.export_file_mode, "history_mode": args.export_history}}
+    retention_options = {"delete_after_days": args.retention_days or None,
+                         "max_disk_mb": args.max_disk_mb or None}
+    data_manager = DataUpdateManager(appliances, value_generator, left_gui, right_gui,
+                                     export_formats=args.export_formats, export_options=export_options,
+                                     retention_options=retention_options)
+    data_manager.start_updates()
+    upper_gui.history_query = data_manager.history_query
+    services_time = time.perf_counter() - startup_start
 
     #Initialising GUI notification
     right_gui.log_events("GUI initialized")
+    right_gui.log_events(f"Start-up: imports {import_time:.2f} s, first paint {first_paint_time:.2f} s, "
+                         f"data services {services_time:.2f} s")
+    if restored_from:
+        right_gui.log_events(f"Restored state from {os.path.basename(restored_from)} ({restore_time * 1000:.0f} ms)")
+    if recovered_samples:
+        right_gui.log_events(f"Recovered {recovered_samples} samples from the sample log")
 
     root_gui.root.mainloop()
     
@@ -0,0 +1,146 @@
+from tkinter import *
+from collections import deque
+from datetime import datetime
+import cProfile
+import os
+import time
+import numpy as np
+
+
+class RenderMonitor:
+    """
+    Render-performance readout for the main window.
+    Shows graph frames per second, the last and p99 time spent rendering a
+    frame, Tk event-queue lag (how late a scheduled after() callback runs)
+    and tick-to-pixel latency (from a data tick to the end of the idle
+    redraw that paints it). F12 toggles the overlay; Shift+F12 saves a
+    cProfile capture of the Tk thread.
+    Measurements are only taken while the overlay is shown or a capture runs.
+    """
+
+    REFRESH_INTERVAL = 500  # ms between overlay updates
+    HEARTBEAT_INTERVAL = 100  # ms between event-queue lag probes
+    WINDOW = 500  # Samples kept for the p99 figures
+
+    def __init__(self, root, log=print, profile_folder=os.path.join("data", "profiles"), profile_seconds=10):
+        """
+        Initialize the render monitor.
+
+        Args:
+            root: Main Tk window
+            log: Called with a message when a profile has been written
+            profile_folder: Where cProfile captures are saved
+            profile_seconds: Length of a capture started with Shift+F12
+        """
+        self.root = root
+        self.log = log
+        self.profile_folder = profile_folder
+        self.profile_seconds = profile_seconds
+        self.enabled = False
+        self.profiler = None
+
+        self.frame_times = deque()  # perf_counter of recent frames, for FPS
+        self.render_durations = deque(maxlen=self.WINDOW)
+        self.lags = deque(maxlen=self.WINDOW)
+        self.latencies = deque(maxlen=self.WINDOW)
+        self.heartbeat_due = None
+        self.heartbeat_job = None
+        self.refresh_job = None
+
+        self.label = Label(root, text="", font=("TkFixedFont", 8), bg="black", fg="#00ff00",
+                           justify=LEFT, anchor='w')
+        root.bind('<F12>', lambda event: self.toggle())
+        root.bind('<Shift-F12>', lambda event: self.start_profile(self.profile_seconds))
+
+    # Overlay
+    def toggle(self):
+        if self.enabled:
+            self.hide()
+        else:
+            self.show()
+
+    def show(self):
+        """Show the overlay in the bottom-right corner and start measuring."""
+        self.enabled = True
+        self.label.place(relx=1.0, rely=1.0, anchor='se')
+        self.label.lift()
+        self._schedule_heartbeat()
+        self._refresh()
+
+    def hide(self):
+        self.enabled = False
+        self.label.place_forget()
+        for job in (self.heartbeat_job, self.refresh_job):
+            if job is not None:
+                self.root.after_cancel(job)
+        self.heartbeat_job = self.refresh_job = None
+        self.heartbeat_due = None
+
+    def _refresh(self):
+        self.label.config(text=self.summary())
+        self.refresh_job = self.root.after(self.REFRESH_INTERVAL, self._refresh)
+
+    def summary(self):
+        """Current figures as overlay text."""
+        now = time.perf_counter()
+        while self.frame_times and now - self.frame_times[0] > 1:
+            self.frame_times.popleft()
+        lines = [f"FPS      {len(self.frame_times):>6d}",
+                 f"render   {self._format(self.render_durations)}",
+                 f"tk lag   {self._format(self.lags)}",
+                 f"latency  {self._format(self.latencies)}"]
+        if self.profiler is not None:
+            lines.append("profiling...")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _format(samples):
+        """'last / p99' in milliseconds."""
+        if not samples:
+            return "     -"
+        return f"{samples[-1] * 1000:6.1f} / {np.percentile(samples, 99) * 1000:6.1f} ms"
+
+    # Measurements (all called on the Tk thread)
+    def record_frame(self, duration):
+        """A graph frame was rendered in duration seconds."""
+        if self.enabled:
+            self.frame_times.append(time.perf_counter())
+            self.render_durations.append(duration)
+
+    def track_latency(self, tick_time):
+        """
+        Measure from a data tick (perf_counter) to the moment Tk has painted it.
+        Redraws run as idle callbacks, so the next idle callback runs after them.
+        """
+        if self.enabled:
+            self.root.after_idle(lambda: self.latencies.append(time.perf_counter() - tick_time))
+
+    def _schedule_heartbeat(self):
+        self.heartbeat_due = time.perf_counter() + self.HEARTBEAT_INTERVAL / 1000
+        self.heartbeat_job = self.root.after(self.HEARTBEAT_INTERVAL, self._heartbeat)
+
+    def _heartbeat(self):
+        """How late the event loop ran this callback is the event-queue lag."""
+        self.lags.append(max(0.0, time.perf_counter() - self.heartbeat_due))
+        self._schedule_heartbeat()
+
+    # Profiling
+    def start_profile(self, seconds):
+        """Profile the Tk thread for seconds, then write the capture to the profile folder."""
+        if self.profiler is not None:
+            return
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()  # Only profiles the calling (Tk) thread
+        self.root.after(int(seconds * 1000), self._finish_profile)
+
+    def _finish_profile(self):
+        self.profiler.disable()
+        if not os.path.exists(self.profile_folder):
+            os.makedirs(self.profile_folder)
+        path = os.path.join(self.profile_folder, f"gui_{datetime.now().strftime('%Y%m%d_%H%M%S')}.prof")
+        try:
+            self.profiler.dump_stats(path)
+            self.log(f"GUI profile saved to {path}")
+        except OSError as e:
+            self.log(f"Error saving GUI profile: {e}")
+        self.profiler = None
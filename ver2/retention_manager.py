@@ -0,0 +1,310 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import zipfile
+from datetime import datetime, timedelta
+
+
+class RetentionManager:
+    """
+    Keeps the exports and the persisted sample data bounded on long-running panels.
+    Runs on a low-priority background thread and, on every pass:
+    merges loose exports into one compressed archive per day, merges old daily
+    archives into monthly archives, deletes anything past its retention age
+    (exports, archives, sample log segments and rows of the sample store) and
+    removes the oldest data while everything together exceeds its disk-usage ceiling.
+    """
+
+    FILE_DATE_PATTERN = re.compile(r"^appliance_data_(\d{8})")
+    ARCHIVE_PATTERN = re.compile(r"^appliance_data_(\d{6}|\d{8})\.zip$")
+    LOG_SEGMENT_PATTERN = re.compile(r"^samples_(\d{8})_\d{2}\.log$")
+    SAMPLE_TABLES = ("samples", "rollup_1m", "rollup_1h")
+
+    def __init__(self, export_folders=("exports",), daily_after_days=1, monthly_after_days=31,
+                 delete_after_days=365, max_disk_mb=None, check_interval=3600,
+                 sample_db=None, sample_log_folder=None):
+        """
+        Initialize the retention manager.
+
+        Args:
+            export_folders: Folders holding the exports (one per export backend folder)
+            daily_after_days: Loose exports older than this are merged into daily archives
+            monthly_after_days: Daily archives older than this are merged into monthly archives
+            delete_after_days: Data older than this is deleted (None keeps it)
+            max_disk_mb: Ceiling for all managed data; oldest data is deleted first (None disables)
+            check_interval: Seconds between retention passes
+            sample_db: SQLite sample store whose rows are aged out (None skips it)
+            sample_log_folder: Folder of the hourly sample log segments (None skips it)
+        """
+        self.export_folders = sorted(set(export_folders))
+        self.sample_db = sample_db
+        self.sample_log_folder = sample_log_folder
+        self.daily_after_days = daily_after_days
+        self.monthly_after_days = monthly_after_days
+        self.delete_after_days = delete_after_days
+        self.max_disk_mb = max_disk_mb
+        self.check_interval = check_interval
+        self.stop_event = threading.Event()
+        self.worker_thread = None
+
+    def start(self):
+        """Start the retention thread"""
+        self.stop_event.clear()
+        self.worker_thread = threading.Thread(target=self._retention_loop, daemon=True)
+        self.worker_thread.start()
+
+    def stop(self):
+        """Stop the retention thread after the current step"""
+        self.stop_event.set()
+
+    def _retention_loop(self):
+        """Run a retention pass every check_interval seconds"""
+        self._lower_thread_priority()
+        while not self.stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Error in export retention: {e}")
+            self.stop_event.wait(self.check_interval)
+
+    def _lower_thread_priority(self):
+        """Lower this thread's scheduling priority so sampling is never delayed."""
+        try:
+            os.nice(10)  # Per-thread on Linux; unavailable on Windows
+        except (AttributeError, OSError):
+            pass
+
+    def run_once(self, today=None):
+        """Run one full retention pass."""
+        today = today or datetime.now().date()
+        for export_folder in self.export_folders:
+            if not os.path.isdir(export_folder):
+                continue
+            archive_folder = os.path.join(export_folder, "archive")
+            os.makedirs(archive_folder, exist_ok=True)
+            self._archive_loose_exports(export_folder, archive_folder, today)
+            self._merge_monthly_archives(archive_folder, today)
+
+        self._delete_expired(today)
+        self._enforce_disk_ceiling(today)
+
+    # Compaction
+    def _archive_loose_exports(self, export_folder, archive_folder, today):
+        """Merge loose exports older than daily_after_days into one zip per day."""
+        cutoff = today - timedelta(days=self.daily_after_days)
+        by_day = {}
+        for filename in os.listdir(export_folder):
+            file_date = self._parse_file_date(filename)
+            if file_date is None or file_date > cutoff or self._is_live_file(export_folder, filename):
+                continue
+            by_day.setdefault(file_date.strftime('%Y%m%d'), []).append(filename)
+
+        for day, filenames in sorted(by_day.items()):
+            if self.stop_event.is_set():
+                return
+            archive_path = os.path.join(archive_folder, f"appliance_data_{day}.zip")
+            paths = [os.path.join(export_folder, filename) for filename in sorted(filenames)]
+            self._add_to_archive(archive_path, paths)
+
+    def _merge_monthly_archives(self, archive_folder, today):
+        """Merge daily archives older than monthly_after_days into one zip per month."""
+        cutoff = today - timedelta(days=self.monthly_after_days)
+        by_month = {}
+        for filename in os.listdir(archive_folder):
+            match = self.ARCHIVE_PATTERN.match(filename)
+            if not match or len(match.group(1)) != 8:
+                continue
+            day = datetime.strptime(match.group(1), '%Y%m%d').date()
+            if day <= cutoff:
+                by_month.setdefault(match.group(1)[:6], []).append(filename)
+
+        for month, filenames in sorted(by_month.items()):
+            if self.stop_event.is_set():
+                return
+            archive_path = os.path.join(archive_folder, f"appliance_data_{month}.zip")
+            paths = [os.path.join(archive_folder, filename) for filename in sorted(filenames)]
+            self._add_to_archive(archive_path, paths, unpack_archives=True)
+
+    def _add_to_archive(self, archive_path, paths, unpack_archives=False):
+        """
+        Add files (or the members of zip archives) to an archive, then delete the sources.
+        The archive is rebuilt in a temporary file and swapped in, so a power cut
+        never loses data that was already archived.
+        """
+        temp_path = archive_path + ".tmp"
+        with zipfile.ZipFile(temp_path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=9) as target:
+            existing = set()
+            if os.path.exists(archive_path):
+                with zipfile.ZipFile(archive_path) as source:
+                    for info in source.infolist():
+                        target.writestr(info, source.read(info))
+                        existing.add(info.filename)
+
+            for path in paths:
+                if unpack_archives:
+                    with zipfile.ZipFile(path) as source:
+                        for info in source.infolist():
+                            if info.filename not in existing:
+                                target.writestr(info, source.read(info))
+                                existing.add(info.filename)
+                elif os.path.basename(path) not in existing:
+                    target.write(path, os.path.basename(path))
+                    existing.add(os.path.basename(path))
+                time.sleep(0)  # Yield to the sampling threads between files
+
+        os.replace(temp_path, archive_path)
+        for path in paths:
+            os.remove(path)
+
+    # Deletion
+    def _delete_expired(self, today):
+        """Delete exports, archives, log segments and stored samples past delete_after_days."""
+        if self.delete_after_days is None:
+            return
+        cutoff = today - timedelta(days=self.delete_after_days)
+        for path, newest_date in self._dated_files(today):
+            if newest_date < cutoff:
+                os.remove(path)
+        self._delete_samples_before(cutoff, self.SAMPLE_TABLES)
+
+    def _enforce_disk_ceiling(self, today):
+        """
+        Delete the oldest data until everything fits under max_disk_mb: files
+        (exports, archives, sample log segments) and days of raw samples in the
+        store (its rollups are kept) go oldest first, files before samples of
+        the same day. Today's samples are never deleted.
+        """
+        if self.max_disk_mb is None:
+            return
+        files = sorted(self._dated_files(today), key=lambda entry: entry[1])
+        sizes = {path: os.path.getsize(path) for path, _ in files}
+        file_bytes = sum(sizes.values())
+        total = file_bytes + self._sample_db_bytes()
+        limit = self.max_disk_mb * 1024 * 1024
+
+        next_file = 0
+        while total > limit and not self.stop_event.is_set():
+            oldest_sample = self._oldest_sample_date()
+            if next_file < len(files) and (oldest_sample is None or files[next_file][1] <= oldest_sample):
+                path = files[next_file][0]
+                os.remove(path)
+                file_bytes -= sizes[path]
+                next_file += 1
+            elif oldest_sample is not None and oldest_sample < today:
+                self._delete_samples_before(oldest_sample + timedelta(days=1), ("samples",))
+            else:
+                break
+            # Free pages are reused by the store, so its live size is what counts
+            total = file_bytes + self._sample_db_bytes()
+
+    def _dated_files(self, today):
+        """
+        Return (path, newest_date) for every loose export, archive and sample log
+        segment. Segments from the last day are kept for crash recovery.
+        """
+        entries = []
+        for export_folder in self.export_folders:
+            if not os.path.isdir(export_folder):
+                continue
+            for filename in os.listdir(export_folder):
+                file_date = self._parse_file_date(filename)
+                if file_date is not None and not self._is_live_file(export_folder, filename):
+                    entries.append((os.path.join(export_folder, filename), file_date))
+
+            archive_folder = os.path.join(export_folder, "archive")
+            if not os.path.isdir(archive_folder):
+                continue
+            for filename in os.listdir(archive_folder):
+                match = self.ARCHIVE_PATTERN.match(filename)
+                if not match:
+                    continue
+                stamp = match.group(1)
+                if len(stamp) == 8:
+                    newest_date = datetime.strptime(stamp, '%Y%m%d').date()
+                else:
+                    # A monthly archive is as new as the last day of its month
+                    first_of_month = datetime.strptime(stamp, '%Y%m').date()
+                    newest_date = (first_of_month + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+                entries.append((os.path.join(archive_folder, filename), newest_date))
+
+        if self.sample_log_folder and os.path.isdir(self.sample_log_folder):
+            for filename in os.listdir(self.sample_log_folder):
+                match = self.LOG_SEGMENT_PATTERN.match(filename)
+                if match:
+                    segment_date = datetime.strptime(match.group(1), '%Y%m%d').date()
+                    if segment_date < today - timedelta(days=1):
+                        entries.append((os.path.join(self.sample_log_folder, filename), segment_date))
+        return entries
+
+    # Sample store
+    def _connect_sample_db(self):
+        """Open the sample store, or return None when there is none yet."""
+        if not self.sample_db or not os.path.exists(self.sample_db):
+            return None
+        return sqlite3.connect(self.sample_db, timeout=30)
+
+    def _sample_db_bytes(self):
+        """Bytes of the sample store in use (free pages excluded)."""
+        connection = self._connect_sample_db()
+        if connection is None:
+            return 0
+        try:
+            page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+            pages = connection.execute("PRAGMA page_count").fetchone()[0]
+            free_pages = connection.execute("PRAGMA freelist_count").fetchone()[0]
+            return (pages - free_pages) * page_size
+        finally:
+            connection.close()
+
+    def _oldest_sample_date(self):
+        """Date of the oldest raw sample in the store, or None."""
+        connection = self._connect_sample_db()
+        if connection is None:
+            return None
+        try:
+            oldest = connection.execute("SELECT MIN(ts) FROM samples").fetchone()[0]
+        except sqlite3.OperationalError:
+            oldest = None  # Store not created yet
+        finally:
+            connection.close()
+        return datetime.fromtimestamp(oldest / 1000).date() if oldest is not None else None
+
+    def _delete_samples_before(self, day, tables):
+        """Delete the rows of the given store tables older than the start of day."""
+        connection = self._connect_sample_db()
+        if connection is None:
+            return
+        cutoff_ms = int(datetime.combine(day, datetime.min.time()).timestamp() * 1000)
+        try:
+            with connection:
+                for table in tables:
+                    connection.execute(f"DELETE FROM {table} WHERE ts < ?", (cutoff_ms,))
+        except sqlite3.OperationalError as e:
+            print(f"Error pruning sample store: {e}")
+        finally:
+            connection.close()
+
+    def _is_live_file(self, export_folder, filename):
+        """
+        True for files still being written: temporary files, daily segments and
+        the side index of a day whose workbook has not been built from them yet.
+        The daily exporter holds the only copy of that day in these files.
+        """
+        if filename.endswith((".tmp", ".segment.csv")):
+            return True
+        if filename.endswith("_index.csv"):
+            data_segment = filename[:-len("_index.csv")] + "_data.segment.csv"
+            return os.path.exists(os.path.join(export_folder, data_segment))
+        return False
+
+    def _parse_file_date(self, filename):
+        """Return the date encoded in an export filename, or None if it is not an export."""
+        match = self.FILE_DATE_PATTERN.match(filename)
+        if not match:
+            return None
+        try:
+            return datetime.strptime(match.group(1), '%Y%m%d').date()
+        except ValueError:
+            return None
@@ -19,6 +19,7 @@ class Right_GUI:
         self.current_frame = None
         self.log_data = []  # Store persistent log data
         self.value_generator = None  # Will be set by DataUpdateManager
+        self.on_fleet_changed = None  # Will be set by DataUpdateManager
         
         # Initialize with logs frame as default view
         self.createLogs(root)
@@ -332,6 +333,10 @@ class Right_GUI:
             # Log the successful save operation
             self.log_events(f"Settings saved for {current_appliance.name} ({selected_type})")
             
+            # Persist the new settings with the next fleet snapshot
+            if self.on_fleet_changed:
+                self.on_fleet_changed()
+            
             # Show success confirmation
             msgbox.showinfo(
                 "Settings Saved", 
@@ -0,0 +1,61 @@
+from collections import deque
+import numpy as np
+
+
+class RollingExtrema:
+    """
+    Minimum and maximum of the last `window` samples of a power history.
+    Two monotonic deques of (sample number, value) hold only the samples that
+    can still become the extreme, so every update is amortized O(1) and
+    reading the range is O(1); the history is never rescanned.
+    Not thread-safe: add() and the properties must run on one thread. Other
+    threads read a (minimum, maximum) tuple published by that thread.
+    """
+
+    def __init__(self, window, values=()):
+        """Initialize the window, optionally primed with the current history (oldest first)."""
+        self.window = window
+        self.count = len(values)
+        self.minimum_queue = deque()
+        self.maximum_queue = deque()
+        if self.count:
+            self._seed(np.asarray(values, dtype=float)[-window:])
+
+    def _seed(self, values):
+        """
+        Build both queues from a whole history in one vectorised pass: a sample
+        stays in the minimum queue only while it is below every later sample
+        (above, for the maximum), which is a comparison with the suffix minimum.
+        """
+        first = self.count - len(values) + 1  # Sample number of values[0]
+        suffix_min = np.minimum.accumulate(values[::-1])[::-1]
+        suffix_max = np.maximum.accumulate(values[::-1])[::-1]
+        keep_min = np.append(values[:-1] < suffix_min[1:], True)
+        keep_max = np.append(values[:-1] > suffix_max[1:], True)
+        for keep, queue in ((keep_min, self.minimum_queue), (keep_max, self.maximum_queue)):
+            positions = np.flatnonzero(keep)
+            queue.extend(zip((positions + first).tolist(), values[positions].tolist()))
+
+    def add(self, value):
+        """Add the newest sample; the one leaving the window is dropped."""
+        self.count += 1
+        while self.minimum_queue and self.minimum_queue[-1][1] >= value:
+            self.minimum_queue.pop()
+        self.minimum_queue.append((self.count, value))
+        while self.maximum_queue and self.maximum_queue[-1][1] <= value:
+            self.maximum_queue.pop()
+        self.maximum_queue.append((self.count, value))
+
+        expired = self.count - self.window
+        if self.minimum_queue[0][0] <= expired:
+            self.minimum_queue.popleft()
+        if self.maximum_queue[0][0] <= expired:
+            self.maximum_queue.popleft()
+
+    @property
+    def minimum(self):
+        return self.minimum_queue[0][1] if self.minimum_queue else 0
+
+    @property
+    def maximum(self):
+        return self.maximum_queue[0][1] if self.maximum_queue else 0
@@ -0,0 +1,251 @@
+import glob
+import mmap
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+import numpy as np
+
+
+# One fixed-size record per sample: timestamp (ms since epoch), appliance ID, power (W)
+RECORD_DTYPE = np.dtype([('ts', '<i8'), ('appliance_id', '<i4'), ('value', '<f8')])
+
+
+class SampleLog:
+    """
+    Append-only, memory-mapped binary log of every power sample.
+    Records are fixed-size (ts, appliance_id, value) entries written into
+    preallocated, zero-filled hourly segment files. A record with ts == 0 marks
+    the end of valid data, so after a power cut the log is recovered by finding
+    the first empty record. Reads are zero-copy numpy.frombuffer views of the
+    mapped segments. The update thread only queues samples; a writer thread
+    appends, flushes and rotates, so a slow disk never blocks a tick.
+    """
+
+    def __init__(self, log_folder=os.path.join("data", "sample_log"), flush_interval=5,
+                 grow_records=65536):
+        """
+        Initialize the sample log.
+
+        Args:
+            log_folder: Folder holding the hourly segment files
+            flush_interval: Seconds between flushes of the mapped pages to disk
+            grow_records: Records added each time a segment file is extended
+        """
+        self.log_folder = log_folder
+        self.flush_interval = flush_interval
+        self.grow_records = grow_records
+        self.pending = queue.Queue()
+        self.running = False
+        self.writer_thread = None
+
+        # Current segment (owned by the writer thread)
+        self.segment_hour = None
+        self.segment_file = None
+        self.segment_map = None
+        self.segment_used = 0
+        self.segment_capacity = 0
+
+        if not os.path.exists(log_folder):
+            os.makedirs(log_folder)
+
+    def start(self):
+        """Start the writer thread"""
+        self.running = True
+        self.writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self.writer_thread.start()
+
+    def stop(self):
+        """Stop the writer thread after writing queued samples"""
+        self.running = False
+        self.pending.put(None)
+        if self.writer_thread is not None:
+            self.writer_thread.join(timeout=5)
+
+    def record_tick(self, timestamp, samples):
+        """
+        Queue one tick of samples without blocking.
+
+        Args:
+            timestamp: datetime of the tick
+            samples: List of (appliance_id, name, power) tuples
+        """
+        ts = int(timestamp.timestamp() * 1000)
+        records = np.empty(len(samples), dtype=RECORD_DTYPE)
+        records['ts'] = ts
+        records['appliance_id'] = [sample[0] for sample in samples]
+        records['value'] = [sample[2] for sample in samples]
+        self.pending.put((timestamp, records))
+
+    # Writing
+    def _writer_loop(self):
+        """Append queued records, flushing periodically and rotating hourly"""
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self.pending.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = False
+
+            if item:
+                timestamp, records = item
+                try:
+                    self._append(timestamp, records)
+                except (OSError, ValueError) as e:
+                    print(f"Error writing sample log: {e}")
+
+            if self.segment_map is not None and (item is None or time.monotonic() - last_flush >= self.flush_interval):
+                self.segment_map.flush()
+                last_flush = time.monotonic()
+
+            if item is None and not self.running:
+                break
+        self._close_segment()
+
+    def _append(self, timestamp, records):
+        """Append records to the segment for the timestamp's hour."""
+        hour = timestamp.strftime('%Y%m%d_%H')
+        if hour != self.segment_hour:
+            self._close_segment()
+            self._open_segment(hour)
+
+        count = len(records)
+        if self.segment_used + count > self.segment_capacity:
+            self._grow_segment(self.segment_used + count)
+
+        start = self.segment_used * RECORD_DTYPE.itemsize
+        self.segment_map[start:start + count * RECORD_DTYPE.itemsize] = records.tobytes()
+        self.segment_used += count
+
+    def _segment_path(self, hour):
+        return os.path.join(self.log_folder, f"samples_{hour}.log")
+
+    def _open_segment(self, hour):
+        """Open (or reopen after a restart) an hourly segment and find its end."""
+        path = self._segment_path(hour)
+        if not os.path.exists(path):
+            open(path, 'wb').close()
+        self.segment_file = open(path, 'r+b')
+        self.segment_hour = hour
+
+        size = os.path.getsize(path)
+        self.segment_capacity = size // RECORD_DTYPE.itemsize
+        if self.segment_capacity == 0:
+            self.segment_map = None
+            self.segment_used = 0
+            self._grow_segment(1)
+        else:
+            self.segment_map = mmap.mmap(self.segment_file.fileno(), self.segment_capacity * RECORD_DTYPE.itemsize)
+            self.segment_used = self._valid_length(self.segment_map, self.segment_capacity)
+
+    def _grow_segment(self, required):
+        """Extend the segment file with zeroed records and remap it."""
+        capacity = max(required, self.segment_capacity + self.grow_records)
+        if self.segment_map is not None:
+            self.segment_map.flush()
+            self.segment_map.close()
+        self.segment_file.truncate(capacity * RECORD_DTYPE.itemsize)
+        self.segment_map = mmap.mmap(self.segment_file.fileno(), capacity * RECORD_DTYPE.itemsize)
+        self.segment_capacity = capacity
+
+    def _close_segment(self):
+        """Flush the current segment and trim its unused preallocated tail."""
+        if self.segment_map is not None:
+            self.segment_map.flush()
+            self.segment_map.close()
+            self.segment_map = None
+        if self.segment_file is not None:
+            self.segment_file.truncate(self.segment_used * RECORD_DTYPE.itemsize)
+            self.segment_file.close()
+            self.segment_file = None
+        self.segment_hour = None
+        self.segment_used = 0
+        self.segment_capacity = 0
+
+    # Reading and recovery
+    @staticmethod
+    def _valid_length(buffer, capacity):
+        """Number of valid records: everything before the first empty (ts == 0) record."""
+        records = np.frombuffer(buffer, dtype=RECORD_DTYPE, count=capacity)
+        empty = np.flatnonzero(records['ts'] == 0)
+        return int(empty[0]) if len(empty) else capacity
+
+    def read_segment(self, path):
+        """
+        Return the valid records of a segment as a zero-copy array over a read-only mapping.
+        The mapping stays open for as long as the returned array is referenced.
+        """
+        size = os.path.getsize(path)
+        capacity = size // RECORD_DTYPE.itemsize
+        if capacity == 0:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        with open(path, 'rb') as segment_file:
+            mapping = mmap.mmap(segment_file.fileno(), capacity * RECORD_DTYPE.itemsize, access=mmap.ACCESS_READ)
+        records = np.frombuffer(mapping, dtype=RECORD_DTYPE, count=capacity)
+        return records[:self._valid_length(mapping, capacity)]
+
+    def read(self, start, end, appliance_id=None):
+        """Return records between two datetimes (inclusive), optionally for one appliance."""
+        start_ms = int(start.timestamp() * 1000)
+        end_ms = int(end.timestamp() * 1000)
+        blocks = []
+        hour = start.replace(minute=0, second=0, microsecond=0)
+        while hour <= end:
+            path = self._segment_path(hour.strftime('%Y%m%d_%H'))
+            if os.path.exists(path):
+                records = self.read_segment(path)
+                mask = (records['ts'] >= start_ms) & (records['ts'] <= end_ms)
+                if appliance_id is not None:
+                    mask &= records['appliance_id'] == appliance_id
+                blocks.append(records[mask])
+            hour += timedelta(hours=1)
+        return np.concatenate(blocks) if blocks else np.empty(0, dtype=RECORD_DTYPE)
+
+    def latest_segments(self, count=2):
+        """Paths of the newest segment files, oldest first."""
+        return sorted(glob.glob(os.path.join(self.log_folder, "samples_*.log")))[-count:]
+
+    def restore_recent(self, appliances, now=None):
+        """
+        Crash recovery: refill each appliance's power buffer from the log,
+        placing samples by their age relative to now. Returns the number of samples restored.
+        """
+        now = now or datetime.now()
+        now_ms = int(now.timestamp() * 1000)
+        buffer_length = max((a.history_length for a in appliances.values() if a is not None), default=0)
+        cutoff_ms = now_ms - buffer_length * 1000
+
+        # Only the newest buffer_length seconds matter; segments are time-ordered
+        blocks = []
+        for path in self.latest_segments():
+            records = self.read_segment(path)
+            blocks.append(records[np.searchsorted(records['ts'], cutoff_ms):])
+        if not blocks:
+            return 0
+        recent = np.concatenate(blocks)
+
+        # Group by appliance with one sort
+        order = np.argsort(recent['appliance_id'], kind='stable')
+        ids = recent['appliance_id'][order]
+        # The summary is rebuilt from the appliances
+        restorable = [a for a in appliances.values() if a is not None and getattr(a, 'type', 0) != -1]
+        keys = np.array([a.ID for a in restorable], dtype=ids.dtype)
+        firsts = np.searchsorted(ids, keys).tolist()
+        lasts = np.searchsorted(ids, keys + 1).tolist()
+        restored = 0
+        for appliance, first, last in zip(restorable, firsts, lasts):
+            if first == last:
+                continue
+            rows = recent[order[first:last]]
+            # OFF appliances log zeros; they keep their buffer unallocated
+            if not appliance.has_history() and not rows['value'].any():
+                continue
+            buffer = np.array(appliance.power, dtype=float)
+            slots = len(buffer) - 1 - (now_ms - rows['ts']) // 1000
+            valid = (slots >= 0) & (slots < len(buffer))
+            if valid.any():
+                buffer[slots[valid]] = rows['value'][valid]
+                appliance.power = buffer.tolist()
+                restored += int(valid.sum())
+        return restored
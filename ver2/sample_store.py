@@ -0,0 +1,202 @@
+import os
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+
+
+class SampleStore:
+    """
+    Local SQLite time-series store for every per-second power sample.
+    The update thread only queues each tick's samples; a dedicated writer thread
+    inserts them in batches (one transaction per batch_ticks ticks) with
+    executemany, so a slow SD card never delays the tick.
+    The database runs in WAL mode so queries can read while the writer commits.
+    """
+
+    SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS appliances (
+               appliance_id INTEGER PRIMARY KEY,
+               name TEXT NOT NULL
+           )""",
+        # Clustered on (appliance_id, ts): per-appliance time ranges are one range scan
+        """CREATE TABLE IF NOT EXISTS samples (
+               appliance_id INTEGER NOT NULL,
+               ts INTEGER NOT NULL,
+               power REAL NOT NULL,
+               PRIMARY KEY (appliance_id, ts)
+           ) WITHOUT ROWID""",
+        # Covering index for fleet-wide time ranges
+        "CREATE INDEX IF NOT EXISTS samples_by_time ON samples (ts, appliance_id, power)",
+    ]
+
+    # Rollup tiers maintained alongside the raw samples: (bucket seconds, table name)
+    ROLLUP_TIERS = [(60, "rollup_1m"), (3600, "rollup_1h")]
+    ROLLUP_SCHEMA = """CREATE TABLE IF NOT EXISTS {table} (
+               appliance_id INTEGER NOT NULL,
+               ts INTEGER NOT NULL,
+               count INTEGER NOT NULL,
+               total REAL NOT NULL,
+               minimum REAL NOT NULL,
+               maximum REAL NOT NULL,
+               PRIMARY KEY (appliance_id, ts)
+           ) WITHOUT ROWID"""
+    # Per-connection staging table: a batch lands here first so only rows new to
+    # `samples` are inserted and rolled up (a duplicate must not be counted twice)
+    STAGING_SCHEMA = """CREATE TEMP TABLE IF NOT EXISTS staged_samples (
+               appliance_id INTEGER NOT NULL,
+               ts INTEGER NOT NULL,
+               power REAL NOT NULL,
+               PRIMARY KEY (appliance_id, ts)
+           ) WITHOUT ROWID"""
+
+    def __init__(self, db_path=os.path.join("data", "samples.db"), batch_ticks=10):
+        """
+        Initialize the sample store.
+
+        Args:
+            db_path: SQLite database file
+            batch_ticks: Number of ticks collected before each insert transaction
+        """
+        self.db_path = db_path
+        self.batch_ticks = batch_ticks
+        self.pending = queue.Queue()
+        self.running = False
+        self.writer_thread = None
+
+        folder = os.path.dirname(db_path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+    def start(self):
+        """Start the writer thread"""
+        self.running = True
+        self.writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self.writer_thread.start()
+
+    def stop(self):
+        """Stop the writer thread after flushing queued samples"""
+        self.running = False
+        self.pending.put(None)
+        if self.writer_thread is not None:
+            self.writer_thread.join(timeout=5)
+
+    def record_tick(self, timestamp, samples):
+        """
+        Queue one tick of samples without blocking.
+
+        Args:
+            timestamp: datetime of the tick
+            samples: List of (appliance_id, name, power) tuples
+        """
+        self.pending.put((int(timestamp.timestamp() * 1000), samples))
+
+    def _connect(self):
+        """Open a connection configured for WAL and batched writes."""
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints, no fsync per commit
+        connection.execute("PRAGMA temp_store=MEMORY")
+        return connection
+
+    def _writer_loop(self):
+        """Collect queued ticks and write them in batches"""
+        connection = self._connect()
+        with connection:
+            for statement in self.SCHEMA:
+                connection.execute(statement)
+            for _, table in self.ROLLUP_TIERS:
+                connection.execute(self.ROLLUP_SCHEMA.format(table=table))
+            connection.execute(self.STAGING_SCHEMA)
+
+        known_appliances = {}
+        rows = []
+        ticks = 0
+        while True:
+            item = self.pending.get()
+            if item is not None:
+                ts, samples = item
+                for appliance_id, name, power in samples:
+                    rows.append((appliance_id, ts, power))
+                    if known_appliances.get(appliance_id) != name:
+                        known_appliances[appliance_id] = name
+                        self._write_appliance(connection, appliance_id, name)
+                ticks += 1
+
+            # Flush on a full batch, or when stopping
+            if rows and (ticks >= self.batch_ticks or item is None):
+                try:
+                    self._write_batch(connection, rows)
+                except sqlite3.Error as e:
+                    print(f"Error writing samples: {e}")
+                rows = []
+                ticks = 0
+
+            if item is None and not self.running:
+                break
+        connection.close()
+
+    def _write_appliance(self, connection, appliance_id, name):
+        """Record (or rename) an appliance"""
+        with connection:
+            connection.execute(
+                "INSERT INTO appliances (appliance_id, name) VALUES (?, ?) "
+                "ON CONFLICT(appliance_id) DO UPDATE SET name = excluded.name",
+                (appliance_id, name))
+
+    def _write_batch(self, connection, rows):
+        """
+        Insert a batch of samples and update the rollup tiers in a single transaction.
+        Samples already stored are ignored (first write wins), and only the rows
+        actually inserted are added to the rollups.
+        """
+        with connection:
+            connection.execute("DELETE FROM staged_samples")
+            connection.executemany(
+                "INSERT OR IGNORE INTO staged_samples (appliance_id, ts, power) VALUES (?, ?, ?)", rows)
+            connection.execute(
+                "DELETE FROM staged_samples WHERE EXISTS (SELECT 1 FROM samples "
+                "WHERE samples.appliance_id = staged_samples.appliance_id AND samples.ts = staged_samples.ts)")
+            inserted = connection.execute("SELECT appliance_id, ts, power FROM staged_samples").fetchall()
+            connection.execute(
+                "INSERT OR IGNORE INTO samples (appliance_id, ts, power) "
+                "SELECT appliance_id, ts, power FROM staged_samples")
+            for bucket_seconds, table in self.ROLLUP_TIERS:
+                connection.executemany(
+                    f"INSERT INTO {table} (appliance_id, ts, count, total, minimum, maximum) "
+                    f"VALUES (?, ?, ?, ?, ?, ?) "
+                    f"ON CONFLICT(appliance_id, ts) DO UPDATE SET "
+                    f"count = count + excluded.count, total = total + excluded.total, "
+                    f"minimum = min(minimum, excluded.minimum), maximum = max(maximum, excluded.maximum)",
+                    self._aggregate(inserted, bucket_seconds * 1000))
+
+    def _aggregate(self, rows, bucket_ms):
+        """Aggregate a batch into (appliance_id, bucket_ts, count, total, min, max) rows."""
+        buckets = {}
+        for appliance_id, ts, power in rows:
+            key = (appliance_id, ts - ts % bucket_ms)
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = [1, power, power, power]
+            else:
+                bucket[0] += 1
+                bucket[1] += power
+                if power < bucket[2]:
+                    bucket[2] = power
+                if power > bucket[3]:
+                    bucket[3] = power
+        return [(appliance_id, ts, *bucket) for (appliance_id, ts), bucket in buckets.items()]
+
+    def query(self, appliance_id, start, end):
+        """
+        Return [(datetime, power), ...] for one appliance between two datetimes (inclusive).
+        Uses its own connection, so it can run on any thread while the writer commits.
+        """
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            rows = connection.execute(
+                "SELECT ts, power FROM samples WHERE appliance_id = ? AND ts BETWEEN ? AND ? ORDER BY ts",
+                (appliance_id, int(start.timestamp() * 1000), int(end.timestamp() * 1000))).fetchall()
+        finally:
+            connection.close()
+        return [(datetime.fromtimestamp(ts / 1000), power) for ts, power in rows]
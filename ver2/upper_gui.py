@@ -44,6 +44,9 @@ class Upper_GUI:
         # Create view switching buttons
         self.btn_logs = Button(self.frame_options, text="Logs", width=10, command=self.command_logs, state='disabled')  # Start with logs view active
         self.btn_settings = Button(self.frame_options, text="Settings", width=10, command=self.command_settings)
+        self.btn_history = Button(self.frame_options, text="History", width=10, command=self.command_history)
+        self.btn_overview = Button(self.frame_options, text="Overview", width=10, command=self.command_overview)
+        self.fleet_overview = None
 
     def OptionMenu(self):
         """
@@ -202,6 +205,10 @@ class Upper_GUI:
                 # Add to appliances dictionary
                 self.appliances[appliance_name] = new_appliance
                 
+                # Persist the new appliance with the next fleet snapshot
+                if self.right_gui.on_fleet_changed:
+                    self.right_gui.on_fleet_changed()
+                
                 # Refresh dropdown menu
                 self._refresh_dropdown_menu()
                 
@@ -259,10 +266,11 @@ class Upper_GUI:
         Create a new appliance object with default settings.
         """
         from appliance import Appliance
-        new_appliance = Appliance(name, appliance_id)
+        new_appliance = Appliance(name, appliance_id, self.appliances["All"].history_length)
         
         # Set default values (these can be customized in settings)
         new_appliance.type = 0  # Default to load
+        new_appliance.added_from_gui = True
         
         return new_appliance
 
@@ -369,6 +377,8 @@ class Upper_GUI:
         # Position option buttons
         self.btn_logs.grid(row=1, column=5, padx=5, pady=3, sticky='e') 
         self.btn_settings.grid(row=1, column=6, padx=5, pady=3, sticky='e') 
+        self.btn_history.grid(row=1, column=7, padx=5, pady=3, sticky='e')
+        self.btn_overview.grid(row=1, column=8, padx=5, pady=3, sticky='e')
 
     def command_switch_power(self):
         """
@@ -432,6 +442,28 @@ class Upper_GUI:
         self.btn_logs.config(state='disabled')  # Disable current view button
         self.btn_settings.config(state='normal')  # Enable alternate view button
 
+    def command_history(self):
+        """
+        Open the long-range history browser for the selected appliance.
+        """
+        appliance = self.get_current_appliance()
+        history_query = getattr(self, 'history_query', None)
+        if appliance is None or history_query is None:
+            return
+        from history_gui import History_GUI
+        History_GUI(self.root, history_query, appliance)
+
+    def command_overview(self):
+        """
+        Open the fleet overview, or bring it to the front if it is already open.
+        Clicking a tile selects that appliance here.
+        """
+        if self.fleet_overview is not None and self.fleet_overview.window.winfo_exists():
+            self.fleet_overview.window.lift()
+            return
+        from fleet_overview_gui import Fleet_Overview_GUI
+        self.fleet_overview = Fleet_Overview_GUI(self.root, self.appliances, on_select=self.option_clicked.set)
+
     def command_settings(self):
         """
         Switch to settings view and update button states.